@@ -6,59 +6,116 @@ Co-Pilot Pipeline
 Connects: LLM → RAG → Validator
 """
 
+import asyncio
+import functools
+import hashlib
 import json
+import os
+import pickle
 import re
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Generator, List, Optional, Tuple
+
+import numpy as np
 
 from llm_client import LLMClient
 from rag_system import RAGSystem
 from validation_engine import ValidationEngine
+from validators.rule_extractor import json_loads, json_dumps_indented
 
 
-class CopilotPipeline:
-    """
-    The actual co-pilot pattern:
-    1. User provides English description
-    2. RAG retrieves relevant grammar rules
-    3. LLM suggests case+function using RAG context
-    4. Validator accepts or rejects
-    5. If rejected, LLM tries again with feedback
-    """
+@dataclass(slots=True)
+class Suggestion:
+    """A case+function suggestion parsed from the LLM (or a keyword rule)"""
+    case: str = "???"
+    function: str = "???"
+    reasoning: str = ""
+    raw: Optional[str] = None  # Unparseable LLM response, if parsing failed
     
-    def __init__(self, grammar_file: Path):
-        """Initialize all components"""
-        print("🔄 Initializing Co-Pilot Pipeline...")
-        
-        self.grammar_file = grammar_file
-        
-        # Initialize components
-        self.llm = LLMClient()
-        self.rag = RAGSystem(grammar_file)
-        self.validator = ValidationEngine(grammar_kb={}, grammar_file=grammar_file)
-        
-        print("✅ Pipeline ready")
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Suggestion":
+        return cls(
+            case=data.get("case", "???"),
+            function=data.get("function", "???"),
+            reasoning=data.get("reasoning") or ""
+        )
     
-    def _build_prompt_without_rag(self, user_input: str) -> str:
-        """Build prompt WITHOUT RAG context (baseline)"""
-        return f"""You are an Ithkuil IV grammar expert.
+    def to_dict(self) -> Dict[str, Any]:
+        """Fields checked by ValidationEngine.validate"""
+        return {
+            "case": self.case,
+            "function": self.function,
+            "reasoning": self.reasoning
+        }
+
+
+@dataclass(slots=True)
+class LLMCall:
+    """One LLM request yielded by a suggestion flow (see CopilotPipeline._run)"""
+    system_prompt: str
+    user_message: str
+    history: Optional[List[Dict[str, str]]] = None
+    max_tokens: int = 0  # 0 = MAX_RESPONSE_TOKENS
+
+
+# Cosine similarity above which two queries share the same RAG context
+# (e.g. "feeling cold involuntarily" vs "experiencing cold involuntarily")
+SEMANTIC_CACHE_THRESHOLD = 0.95
+
+# Classification task: greedy decoding + fixed seed keeps answers reproducible
+# (and therefore cacheable)
+LLM_SEED = 42
+
+# The answer is one small JSON object (~30-60 tokens with a 15-word reasoning)
+MAX_RESPONSE_TOKENS = 80
+
+# Groq JSON mode: the model must emit a single valid JSON object
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+# Cheap pre-LLM classifier: unambiguous keywords -> (case, function).
+# Checked in order; the LLM remains the fallback for everything else.
+# Whole words and exact inflections only ("hearing" but not "heart").
+KEYWORD_RULES = [
+    (re.compile(r"\b(deliberately|intentionally|on purpose)\b", re.I), "ERG", "DYN"),
+    (re.compile(r"\b(using (a|an|the)|with (a|an) (hammer|knife|saw|key|tool|pen|brush))\b", re.I), "INS", "DYN"),
+    (re.compile(
+        r"\b(sneeze[sd]?|sneezing|cough(s|ed|ing)?|cold|hungry|hear(s|d|ing)?|feel(s|ing)?|felt)\b",
+        re.I
+    ), "AFF", "STA"),
+]
+
+
+def match_keyword_rule(user_input: str) -> Optional[Tuple[str, str, str]]:
+    """
+    First KEYWORD_RULES match for an input
+    
+    Returns: (case, function, matched_text), or None if no rule applies
+    """
+    for pattern, case, function in KEYWORD_RULES:
+        match = pattern.search(user_input)
+        if match:
+            return case, function, match.group(0)
+    return None
+
+# Static instructions go in the system message so every request shares a
+# byte-identical prefix (eligible for Groq prompt caching); only the short
+# per-query user message varies.
+SYSTEM_PROMPT_BASELINE = """You are an Ithkuil IV grammar expert.
 
 TASK: Given an English description, select the correct CASE and FUNCTION.
 
 VALID CASES: AFF, ERG, ABS, INS, THM, DAT, LOC, ALL, ABL, etc. (68 total)
 VALID FUNCTIONS: STA (static/states) or DYN (dynamic/actions)
 
-English description: "{user_input}"
-
 Respond with ONLY valid JSON:
-{{"case": "THREE_LETTER_CODE", "function": "STA_or_DYN", "reasoning": "why"}}
+{"case": "THREE_LETTER_CODE", "function": "STA_or_DYN", "reasoning": "why"}
+Limit reasoning to 15 words.
 """
-    
-    def _build_prompt_with_rag(self, user_input: str, rag_context: str) -> str:
-        """Build prompt WITH RAG context"""
-        return f"""You are an Ithkuil IV grammar expert.
 
-TASK: Given an English description, select the correct CASE and FUNCTION.
+SYSTEM_PROMPT_RAG = """You are an Ithkuil IV grammar expert.
+
+TASK: Given an English description (INPUT), select the correct CASE and FUNCTION.
 
 VALID CASES (examples):
 - AFF (Affective): for unwilled experiences like feeling cold, sneezing, emotions
@@ -76,42 +133,258 @@ KEY RULES:
 - ERG case REQUIRES DYN function (agents perform actions)
 - INS case REQUIRES DYN function (instruments are actively used)
 
-RELEVANT GRAMMAR FROM OFFICIAL DOCUMENTATION:
-{rag_context}
+Each INPUT comes with CONTEXT: relevant grammar from the official documentation.
 
-English description: "{user_input}"
+Respond with ONLY valid JSON:
+{"case": "THREE_LETTER_CODE", "function": "STA_or_DYN", "reasoning": "why"}
+Limit reasoning to 15 words.
+"""
+
+# One call answering both experiment arms: A ignores CONTEXT, B uses it
+SYSTEM_PROMPT_AB = """You are an Ithkuil IV grammar expert.
+
+TASK: Given an English description (INPUT), select the correct CASE and FUNCTION twice:
+- without_context: answer from your own knowledge, IGNORING the CONTEXT block
+- with_context: answer using the CONTEXT block (official grammar documentation)
+
+VALID CASES: AFF, ERG, ABS, INS, THM, DAT, LOC, ALL, ABL, etc. (68 total)
+VALID FUNCTIONS: STA (static/states) or DYN (dynamic/actions)
 
 Respond with ONLY valid JSON:
-{{"case": "THREE_LETTER_CODE", "function": "STA_or_DYN", "reasoning": "why"}}
+{"without_context": {"case": "THREE_LETTER_CODE", "function": "STA_or_DYN", "reasoning": "why"},
+ "with_context": {"case": "THREE_LETTER_CODE", "function": "STA_or_DYN", "reasoning": "why"}}
+Limit each reasoning to 15 words.
 """
 
-    def _build_retry_prompt(self, user_input: str, previous_attempt: Dict, error_msg: str, rag_context: str) -> str:
-        """Build prompt for retry after validation failure"""
+
+class CopilotPipeline:
+    """
+    The actual co-pilot pattern:
+    1. User provides English description
+    2. RAG retrieves relevant grammar rules
+    3. LLM suggests case+function using RAG context
+    4. Validator accepts or rejects
+    5. If rejected, LLM tries again with feedback
+    """
+    
+    def __init__(self, grammar_file: Path):
+        """Initialize all components"""
+        print("🔄 Initializing Co-Pilot Pipeline...")
+        
+        self.grammar_file = grammar_file
+        
+        # Initialize components
+        self.llm = LLMClient()
+        self.rag = RAGSystem(grammar_file)
+        self.validator = ValidationEngine(grammar_kb={}, grammar_file=grammar_file, rag=self.rag)
+        
+        # RAG context cache: sha1(n_results + query) -> formatted context
+        # Persisted next to the grammar data so repeated runs skip retrieval
+        self._grammar_hash = hashlib.sha1(grammar_file.read_bytes()).hexdigest()
+        self._ctx_cache_file = grammar_file.parent / ".rag_ctx_cache.pkl"
+        self._ctx_cache: Dict[str, str] = self._load_ctx_cache()
+        
+        # Semantic cache: query embeddings (N x d, unit rows) -> (n_results, context)
+        self._sem_keys = np.empty((0, self.rag.embedding_dim), dtype=np.float32)
+        self._sem_vals: List[Tuple[int, str]] = []
+        
+        # Validated first-attempt answers: (normalized input, with_rag) -> suggest_* return value
+        self._answer_cache_file = grammar_file.parent / ".answer_cache.json"
+        self._answer_cache: Dict[Tuple[str, bool], Tuple] = self._load_answer_cache()
+        
+        print("✅ Pipeline ready")
+    
+    def _load_ctx_cache(self) -> Dict[str, str]:
+        """Load persisted RAG contexts if they match the current grammar"""
+        try:
+            with open(self._ctx_cache_file, 'rb') as f:
+                payload = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ImportError, AttributeError, TypeError, ValueError):
+            return {}  # Missing, corrupt, or pickled under another layout
+        
+        # Grammar changed since the cache was written - contexts are stale
+        if not isinstance(payload, dict) or payload.get("grammar") != self._grammar_hash:
+            return {}
+        entries = payload.get("entries")
+        return entries if isinstance(entries, dict) else {}
+    
+    def _save_ctx_cache(self):
+        """Persist RAG contexts (write to temp file, then atomic rename)"""
+        payload = {"grammar": self._grammar_hash, "entries": self._ctx_cache}
+        tmp_file = self._ctx_cache_file.with_suffix(".tmp")
+        try:
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(payload, f)
+            os.replace(tmp_file, self._ctx_cache_file)
+        except OSError as e:
+            print(f"⚠️  Could not persist RAG context cache: {e}")
+    
+    @staticmethod
+    def _normalize_input(user_input: str) -> str:
+        """Normalize user input for answer cache lookups"""
+        return " ".join(user_input.lower().split())
+    
+    def _answer_cache_fingerprint(self) -> str:
+        """Hash of the prompts and request parameters that shape a cached answer"""
+        digest = hashlib.sha1()
+        for part in (
+            SYSTEM_PROMPT_BASELINE,
+            SYSTEM_PROMPT_RAG,
+            self._build_prompt_without_rag("{input}"),
+            self._build_prompt_with_rag("{input}", "{context}"),
+            f"{MAX_RESPONSE_TOKENS}:{LLM_SEED}:{JSON_RESPONSE_FORMAT}",
+        ):
+            digest.update(part.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _load_answer_cache(self) -> Dict[Tuple[str, bool], Tuple]:
+        """Load persisted validated answers if grammar, model and prompts still match"""
+        try:
+            payload = json_loads(self._answer_cache_file.read_bytes())
+        except (OSError, json.JSONDecodeError):
+            return {}
+        
+        if (not isinstance(payload, dict)
+                or payload.get("grammar") != self._grammar_hash
+                or payload.get("model") != self.llm.model
+                or payload.get("prompts") != self._answer_cache_fingerprint()):
+            return {}
+        try:
+            return {
+                (entry["input"], entry["with_rag"]): (
+                    Suggestion.from_dict(entry["answer"][0]), *entry["answer"][1:]
+                )
+                for entry in payload.get("entries", [])
+            }
+        except (KeyError, TypeError, IndexError, AttributeError):
+            return {}  # Hand-edited or truncated entries - start over
+    
+    def _save_answer_cache(self):
+        """Persist validated answers (write to temp file, then atomic rename)"""
+        payload = {
+            "grammar": self._grammar_hash,
+            "model": self.llm.model,
+            "prompts": self._answer_cache_fingerprint(),
+            "entries": [
+                {"input": user_input, "with_rag": with_rag, "answer": [answer[0].to_dict(), *answer[1:]]}
+                for (user_input, with_rag), answer in self._answer_cache.items()
+            ]
+        }
+        tmp_file = self._answer_cache_file.with_suffix(".tmp")
+        try:
+            tmp_file.write_bytes(json_dumps_indented(payload))
+            os.replace(tmp_file, self._answer_cache_file)
+        except OSError as e:
+            print(f"⚠️  Could not persist answer cache: {e}")
+    
+    def _remember_answer(self, user_input: str, with_rag: bool, answer: Tuple) -> Tuple:
+        """Cache a validated answer and return it unchanged"""
+        self._answer_cache[(self._normalize_input(user_input), with_rag)] = answer
+        self._save_answer_cache()
+        return answer
+    
+    def _build_prompt_without_rag(self, user_input: str) -> str:
+        """Build user message WITHOUT RAG context (baseline, sent after SYSTEM_PROMPT_BASELINE)"""
+        return f'English description: "{user_input}"'
+    
+    def _build_prompt_with_rag(self, user_input: str, rag_context: str) -> str:
+        """Build user message WITH RAG context (sent after SYSTEM_PROMPT_RAG)"""
+        return f'CONTEXT:\n{rag_context}\n\nINPUT: "{user_input}"'
+
+    def _build_prompt_ab(self, user_input: str, rag_context: str) -> str:
+        """Build user message for the combined A/B call (sent after SYSTEM_PROMPT_AB)"""
+        return f'CONTEXT:\n{rag_context}\n\nINPUT: "{user_input}"'
+
+    def _build_retry_prompt(self, user_input: str, error_msg: str) -> str:
+        """Build follow-up message for retry after validation failure"""
         return f"""Your previous suggestion was INVALID. Try again.
 
 VALID FUNCTIONS ARE ONLY: STA or DYN (not EXPERIENCER, not semantic roles)
 VALID CASES ARE: AFF, ERG, ABS, INS, THM, etc. (three-letter codes)
 
-GRAMMAR RULES:
-{rag_context}
-
 REJECTION REASON: {error_msg}
 
-English description: "{user_input}"
+INPUT: "{user_input}"
 
 Respond with ONLY valid JSON:
 {{"case": "THREE_LETTER_CODE", "function": "STA_or_DYN", "reasoning": "why"}}
+Limit reasoning to 15 words.
 """
     
-    def _retrieve_context(self, user_input: str) -> str:
-        """Use RAG to get relevant grammar rules"""
+    @staticmethod
+    def _ctx_key(user_input: str, n_results: int) -> str:
+        """Key for the persisted RAG context cache"""
+        return hashlib.sha1(f"{n_results}:{user_input}".encode('utf-8')).hexdigest()
+    
+    def _store_context(self, key: str, n_results: int, query_embedding: np.ndarray, context: str):
+        """Add a retrieved context to the exact and semantic caches"""
+        self._ctx_cache[key] = context
+        self._sem_keys = np.vstack([self._sem_keys, query_embedding[np.newaxis, :]])
+        self._sem_vals.append((n_results, context))
+    
+    def _retrieve_context(self, user_input: str, n_results: int = 3) -> str:
+        """Use RAG to get relevant grammar rules (cached per query)"""
+        key = self._ctx_key(user_input, n_results)
+        cached = self._ctx_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        # Near-duplicate query? Reuse its context (one gemv over cached keys)
+        query_embedding = self.rag.embed(user_input)
+        if self._sem_vals:
+            sims = self._sem_keys @ query_embedding
+            best = int(np.argmax(sims))
+            best_n_results, best_context = self._sem_vals[best]
+            if sims[best] >= SEMANTIC_CACHE_THRESHOLD and best_n_results == n_results:
+                self._ctx_cache[key] = best_context
+                return best_context
+        
         # Query RAG with user input
-        chunks = self.rag.retrieve(user_input, n_results=3)
+        chunks = self.rag.retrieve(
+            user_input, n_results=n_results, query_embedding=query_embedding
+        )
+        context = self._format_context(chunks)
+        
+        self._store_context(key, n_results, query_embedding, context)
+        self._save_ctx_cache()
+        return context
+    
+    def warm(self, inputs: List[str], n_results: int = 3):
+        """
+        Prefetch RAG context for known inputs before a benchmark loop
+        
+        Uncached inputs are embedded in a single batched call.
+        
+        Args:
+            inputs: English descriptions that will be queried
+            n_results: Chunks per context (must match _retrieve_context)
+        """
+        pending = [
+            text for text in dict.fromkeys(inputs)
+            if self._ctx_key(text, n_results) not in self._ctx_cache
+        ]
+        if not pending:
+            return
+        
+        embeddings = self.rag.embed_batch(pending)
+        for text, query_embedding in zip(pending, embeddings):
+            chunks = self.rag.retrieve(
+                text, n_results=n_results, query_embedding=query_embedding
+            )
+            self._store_context(
+                self._ctx_key(text, n_results), n_results,
+                query_embedding, self._format_context(chunks)
+            )
         
+        self._save_ctx_cache()
+        print(f"🔥 Prefetched RAG context for {len(pending)} inputs")
+    
+    @staticmethod
+    def _format_context(chunks: List) -> str:
+        """Format retrieved chunks as prompt context"""
         if not chunks:
             return "No specific rules found."
         
-        # Format as context
         context_parts = []
         for chunk in chunks:
             context_parts.append(
@@ -121,87 +394,356 @@ Respond with ONLY valid JSON:
         
         return "\n\n".join(context_parts)
 
-    def _parse_llm_response(self, response: str) -> Optional[Dict]:
-        """Extract JSON from LLM response"""
-        # Try to find JSON in response
+    def _parse_llm_response(self, response: str) -> Optional[Suggestion]:
+        """Parse the LLM's JSON-mode response"""
         try:
-            # Look for JSON pattern
-            match = re.search(r'\{[^}]+\}', response, re.DOTALL)
-            if match:
-                return json.loads(match.group())
+            parsed = json_loads(response)
         except json.JSONDecodeError:
-            pass
-        return None
+            return None  # e.g. "Error calling LLM: ..." from LLMClient
+        return Suggestion.from_dict(parsed) if isinstance(parsed, dict) else None
 
-    def suggest_without_rag(self, user_input: str) -> Tuple[Dict, bool, str]:
+    def _keyword_answer(self, user_input: str) -> Optional[Tuple[Suggestion, bool, str, int]]:
         """
-        Get LLM suggestion WITHOUT RAG (baseline for comparison)
+        Answer from KEYWORD_RULES without calling the LLM
         
-        Returns: (suggestion_dict, is_valid, error_or_success_msg)
+        Returns: validated answer with 0 LLM attempts, or None to fall back to the LLM
         """
-        self.llm.reset_conversation()
-        
-        prompt = self._build_prompt_without_rag(user_input)
-        response = self.llm.chat(prompt, max_tokens=200, temperature=0.3)
+        matched = match_keyword_rule(user_input)
+        if matched is None:
+            return None
         
+        case, function, text = matched
+        suggestion = Suggestion(case=case, function=function, reasoning=f"Keyword rule matched '{text}'")
+        result = self.validator.validate(suggestion.to_dict())
+        if result.passed:
+            return suggestion, True, f"Valid via keyword rule (confidence: {result.confidence:.2f})", 0
+        return None
+
+    @staticmethod
+    def _error_message(result, default: str = "Unknown error") -> str:
+        """First validation error message, for reporting and retry feedback"""
+        return result.errors[0].message if result.errors else default
+
+    def _check_without_rag(self, user_input: str, response: str) -> Tuple[Suggestion, bool, str]:
+        """Parse and validate a baseline LLM response"""
         suggestion = self._parse_llm_response(response)
-        if not suggestion:
-            return {"raw": response}, False, "Failed to parse LLM response"
+        if suggestion is None:
+            return Suggestion(raw=response), False, "Failed to parse LLM response"
         
-        # Validate
-        result = self.validator.validate(suggestion)
+        answer = self._validate_without_rag(suggestion)
+        if answer[1]:
+            self._remember_answer(user_input, False, answer)
+        return answer
+
+    def _validate_without_rag(self, suggestion: Suggestion) -> Tuple[Suggestion, bool, str]:
+        """Validate a baseline suggestion (no retry, no autofix, not cached)"""
+        result = self.validator.validate(suggestion.to_dict())
         
         if result.passed:
             return suggestion, True, f"Valid (confidence: {result.confidence:.2f})"
         else:
-            error_msg = result.errors[0].message if result.errors else "Unknown error"
-            return suggestion, False, error_msg
+            return suggestion, False, self._error_message(result)
 
-    def suggest_with_rag(self, user_input: str, max_retries: int = 1) -> Tuple[Dict, bool, str, int]:
+    def _check_retry(self, retry_response: str) -> Optional[Tuple[Suggestion, bool, str, int]]:
         """
-        Get LLM suggestion WITH RAG context
+        Parse and validate a retry response (None if it could not be parsed)
+        
+        Not stored in the answer cache: a max_retries=0 call must not get
+        an answer that took two attempts.
+        """
+        retry_suggestion = self._parse_llm_response(retry_response)
+        if retry_suggestion is None:
+            return None
+        
+        retry_result = self.validator.validate(retry_suggestion.to_dict())
+        if retry_result.passed:
+            return retry_suggestion, True, f"Valid after retry (confidence: {retry_result.confidence:.2f})", 2
+        return retry_suggestion, False, self._error_message(retry_result, "Unknown"), 2
+
+    def _autofix_answer(self, suggestion: Suggestion) -> Optional[Tuple[Suggestion, bool, str, int]]:
+        """
+        Repair a rejected suggestion with ValidationEngine.try_autofix (None if not fixable)
+        
+        Not stored in the answer cache: that only holds answers the LLM got
+        right, so autofix=False callers never see a repaired one.
+        """
+        fixed = self.validator.try_autofix(suggestion.to_dict())
+        if fixed is None:
+            return None
+        
+        fixed_dict, result = fixed
+        return Suggestion.from_dict(fixed_dict), True, f"Valid after autofix (confidence: {result.confidence:.2f})", 1
+
+    def _chat(self, call: LLMCall) -> str:
+        """Send one flow request with the blocking client"""
+        return self.llm.chat_oneshot(
+            call.system_prompt, call.user_message, history=call.history,
+            max_tokens=call.max_tokens or MAX_RESPONSE_TOKENS, temperature=0.0, seed=LLM_SEED,
+            response_format=JSON_RESPONSE_FORMAT
+        )
+
+    async def _achat(self, call: LLMCall) -> str:
+        """Send one flow request with the async client"""
+        return await self.llm.achat(
+            call.user_message, system_prompt=call.system_prompt, history=call.history,
+            max_tokens=call.max_tokens or MAX_RESPONSE_TOKENS, temperature=0.0, seed=LLM_SEED,
+            response_format=JSON_RESPONSE_FORMAT
+        )
+
+    def _run(self, flow: Generator[LLMCall, str, Tuple]) -> Tuple:
+        """
+        Drive a suggestion flow with blocking LLM calls
         
-        Returns: (suggestion_dict, is_valid, message, attempts_used)
+        Flows (_flow_*) hold all caching, prompting and validation logic:
+        they yield an LLMCall whenever they need the model, receive its
+        response, and return the final answer. Only this driver and _arun
+        differ between the sync and async APIs.
         """
-        self.llm.reset_conversation()
+        try:
+            call = next(flow)
+            while True:
+                call = flow.send(self._chat(call))
+        except StopIteration as done:
+            return done.value
+
+    async def _arun(self, flow: Generator[LLMCall, str, Tuple]) -> Tuple:
+        """Drive a suggestion flow with async LLM calls (see _run)"""
+        try:
+            call = next(flow)
+            while True:
+                call = flow.send(await self._achat(call))
+        except StopIteration as done:
+            return done.value
+
+    def _flow_without_rag(self, user_input: str) -> Generator[LLMCall, str, Tuple[Suggestion, bool, str]]:
+        """Baseline flow: cache lookup, one LLM call, validation"""
+        cached = self._answer_cache.get((self._normalize_input(user_input), False))
+        if cached:
+            return cached
+        
+        response = yield LLMCall(SYSTEM_PROMPT_BASELINE, self._build_prompt_without_rag(user_input))
+        return self._check_without_rag(user_input, response)
+
+    def _flow_with_rag(
+        self,
+        user_input: str,
+        max_retries: int,
+        fast_path: bool,
+        autofix: bool
+    ) -> Generator[LLMCall, str, Tuple[Suggestion, bool, str, int]]:
+        """RAG flow: cache, keyword rules, LLM call, validation, autofix, retry"""
+        cached = self._answer_cache.get((self._normalize_input(user_input), True))
+        if cached:
+            return cached
+        
+        if fast_path:
+            keyword_answer = self._keyword_answer(user_input)
+            if keyword_answer:
+                return keyword_answer
         
         # Get RAG context
         rag_context = self._retrieve_context(user_input)
         
         # First attempt
         prompt = self._build_prompt_with_rag(user_input, rag_context)
-        response = self.llm.chat(prompt, max_tokens=200, temperature=0.3)
+        response = yield LLMCall(SYSTEM_PROMPT_RAG, prompt)
         
         suggestion = self._parse_llm_response(response)
-        if not suggestion:
-            return {"raw": response}, False, "Failed to parse LLM response", 1
+        if suggestion is None:
+            return Suggestion(raw=response), False, "Failed to parse LLM response", 1
         
         # Validate
-        result = self.validator.validate(suggestion)
+        result = self.validator.validate(suggestion.to_dict())
         
         if result.passed:
-            return suggestion, True, f"Valid (confidence: {result.confidence:.2f})", 1
+            return self._remember_answer(
+                user_input, True,
+                (suggestion, True, f"Valid (confidence: {result.confidence:.2f})", 1)
+            )
         
-        # Retry with feedback if allowed
+        # Mechanical mistakes are fixed locally, saving the retry round-trip
+        if autofix:
+            autofix_answer = self._autofix_answer(suggestion)
+            if autofix_answer:
+                return autofix_answer
+        
+        # Retry with feedback if allowed (follow-up turn to the first exchange)
         if max_retries > 0:
-            error_msg = result.errors[0].message if result.errors else "Unknown error"
+            retry_prompt = self._build_retry_prompt(user_input, self._error_message(result))
+            history = [
+                {"role": "user", "content": prompt},
+                {"role": "assistant", "content": response}
+            ]
+            retry_response = yield LLMCall(SYSTEM_PROMPT_RAG, retry_prompt, history)
             
-            retry_prompt = self._build_retry_prompt(
-                user_input, suggestion, error_msg, rag_context
-            )
-            retry_response = self.llm.chat(retry_prompt, max_tokens=200, temperature=0.2)
+            retry_answer = self._check_retry(retry_response)
+            if retry_answer:
+                return retry_answer
+        
+        return suggestion, False, self._error_message(result), 1
+
+    def suggest_without_rag(self, user_input: str) -> Tuple[Suggestion, bool, str]:
+        """
+        Get LLM suggestion WITHOUT RAG (baseline for comparison)
+        
+        Returns: (suggestion, is_valid, error_or_success_msg)
+        """
+        return self._run(self._flow_without_rag(user_input))
+
+    def suggest_with_rag(
+        self,
+        user_input: str,
+        max_retries: int = 1,
+        fast_path: bool = True,
+        autofix: bool = True
+    ) -> Tuple[Suggestion, bool, str, int]:
+        """
+        Get LLM suggestion WITH RAG context
+        
+        Args:
+            user_input: English description
+            max_retries: Retries after a validator rejection
+            fast_path: Try KEYWORD_RULES before calling the LLM
+            autofix: Repair mechanical mistakes (ValidationEngine.try_autofix)
+                     before retrying; disable to measure the LLM alone
+        
+        Returns: (suggestion, is_valid, message, attempts_used)
+                 attempts_used is 0 when a keyword rule answered
+        """
+        return self._run(self._flow_with_rag(user_input, max_retries, fast_path, autofix))
+
+    def suggest_ab(self, user_input: str, autofix: bool = True) -> Tuple[Tuple, Tuple]:
+        """
+        Get both experiment arms from ONE LLM call
+        
+        The model answers once ignoring the CONTEXT block and once using it.
+        The WITH-RAG answer gets autofix (if enabled) but no retry (that would
+        be a second call). Falls back to the separate suggest_* calls if the
+        combined response cannot be parsed.
+        
+        Neither answer is read from or written to the answer cache: the
+        WITHOUT-RAG answer was produced with the context in view, so it must
+        not be served to suggest_without_rag (or vice versa).
+        
+        Args:
+            user_input: English description
+            autofix: Repair mechanical mistakes in the WITH-RAG answer
+        
+        Returns: (suggest_without_rag result, suggest_with_rag result)
+        """
+        rag_context = self._retrieve_context(user_input)
+        prompt = self._build_prompt_ab(user_input, rag_context)
+        response = self._chat(LLMCall(SYSTEM_PROMPT_AB, prompt, max_tokens=2 * MAX_RESPONSE_TOKENS))
+        
+        try:
+            data = json_loads(response)
+        except json.JSONDecodeError:
+            data = None
+        if not (isinstance(data, dict)
+                and isinstance(data.get("without_context"), dict)
+                and isinstance(data.get("with_context"), dict)):
+            return (self.suggest_without_rag(user_input),
+                    self.suggest_with_rag(user_input, fast_path=False, autofix=autofix))
+        
+        answer_a = self._validate_without_rag(Suggestion.from_dict(data["without_context"]))
+        
+        suggestion = Suggestion.from_dict(data["with_context"])
+        result = self.validator.validate(suggestion.to_dict())
+        if result.passed:
+            answer_b = suggestion, True, f"Valid (confidence: {result.confidence:.2f})", 1
+        else:
+            answer_b = ((autofix and self._autofix_answer(suggestion))
+                        or (suggestion, False, self._error_message(result), 1))
+        return answer_a, answer_b
+
+    async def asuggest_without_rag(self, user_input: str) -> Tuple[Suggestion, bool, str]:
+        """Async version of suggest_without_rag (stateless, safe to gather)"""
+        return await self._arun(self._flow_without_rag(user_input))
+
+    async def asuggest_with_rag(
+        self,
+        user_input: str,
+        max_retries: int = 1,
+        fast_path: bool = True,
+        autofix: bool = True
+    ) -> Tuple[Suggestion, bool, str, int]:
+        """Async version of suggest_with_rag (stateless, safe to gather)"""
+        return await self._arun(self._flow_with_rag(user_input, max_retries, fast_path, autofix))
+
+    def suggest_batch(
+        self,
+        inputs: List[str],
+        max_retries: int = 1,
+        concurrency: int = 8,
+        fast_path: bool = True,
+        with_baseline: bool = True,
+        autofix: bool = True
+    ) -> Tuple[List[Tuple], List[Tuple]]:
+        """
+        Run both variants for every input concurrently
+        
+        Args:
+            inputs: English descriptions
+            max_retries: Retries allowed per WITH-RAG suggestion
+            concurrency: Max in-flight LLM requests (Groq rate limits)
+            fast_path: Allow KEYWORD_RULES answers for the WITH-RAG variant
+            with_baseline: Also run the WITHOUT-RAG variant (empty list if False)
+            autofix: Allow local autofix for the WITH-RAG variant
             
-            retry_suggestion = self._parse_llm_response(retry_response)
-            if retry_suggestion:
-                retry_result = self.validator.validate(retry_suggestion)
-                if retry_result.passed:
-                    return retry_suggestion, True, f"Valid after retry (confidence: {retry_result.confidence:.2f})", 2
-                else:
-                    error_msg = retry_result.errors[0].message if retry_result.errors else "Unknown"
-                    return retry_suggestion, False, error_msg, 2
+        Returns: (without_rag_results, with_rag_results), in input order
+        """
+        return asyncio.run(
+            self._asuggest_batch(inputs, max_retries, concurrency, fast_path, with_baseline, autofix)
+        )
+
+    async def _asuggest_batch(
+        self,
+        inputs: List[str],
+        max_retries: int,
+        concurrency: int,
+        fast_path: bool,
+        with_baseline: bool = True,
+        autofix: bool = True
+    ) -> Tuple[List[Tuple], List[Tuple]]:
+        """Gather all suggestions, bounded by a semaphore"""
+        semaphore = asyncio.Semaphore(concurrency)
         
-        error_msg = result.errors[0].message if result.errors else "Unknown error"
-        return suggestion, False, error_msg, 1
+        async def limited(coro):
+            async with semaphore:
+                return await coro
+        
+        baseline_inputs = inputs if with_baseline else []
+        try:
+            results = await asyncio.gather(
+                *[limited(self.asuggest_without_rag(text)) for text in baseline_inputs],
+                *[limited(self.asuggest_with_rag(text, max_retries, fast_path, autofix)) for text in inputs]
+            )
+        finally:
+            # The async client is bound to this event loop
+            await self.llm.aclose()
+        
+        split = len(baseline_inputs)
+        return list(results[:split]), list(results[split:])
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_pipeline(grammar_file: Path) -> CopilotPipeline:
+    return CopilotPipeline(grammar_file)
+
+
+def get_pipeline(grammar_file: Path) -> CopilotPipeline:
+    """
+    Shared CopilotPipeline for this process
+    
+    Building a pipeline loads the grammar, builds the RAG index and opens the
+    Groq client, so demo, interactive mode and experiments reuse one instance.
+    
+    Args:
+        grammar_file: Path to grammar JSON (relative paths are resolved first)
+    
+    Returns: the cached pipeline for grammar_file
+    """
+    return _cached_pipeline(Path(grammar_file).resolve())
 
 
 # Quick test
@@ -210,7 +752,7 @@ if __name__ == "__main__":
     if not grammar_file.exists():
         grammar_file = Path("data/grammar_chunks.json")
     
-    pipeline = CopilotPipeline(grammar_file)
+    pipeline = get_pipeline(grammar_file)
     
     test_input = "experiencing cold involuntarily"
     
@@ -229,4 +771,9 @@ if __name__ == "__main__":
     print(f"Suggestion: {suggestion}")
     print(f"Valid: {valid}")
     print(f"Message: {msg}")
-    print(f"Attempts: {attempts}")
\ No newline at end of file
+    print(f"Attempts: {attempts}")
+    
+    print("\n--- BOTH IN ONE CALL ---")
+    (suggestion_a, valid_a, _), (suggestion_b, valid_b, _, _) = pipeline.suggest_ab(test_input)
+    print(f"Without context: {suggestion_a} (valid: {valid_a})")
+    print(f"With context:    {suggestion_b} (valid: {valid_b})")
\ No newline at end of file
@@ -5,12 +5,12 @@ Experiment: Measure LLM Accuracy With vs Without RAG
 This generates the actual numbers for your portfolio.
 """
 
-import json
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Tuple
 
-from copilot import CopilotPipeline
+from copilot import CopilotPipeline, get_pipeline
+from validators.rule_extractor import json_dumps_indented
 
 
 # Test cases with KNOWN correct answers
@@ -79,14 +79,24 @@ def run_experiment(pipeline: CopilotPipeline, num_cases: int = None) -> Dict:
         }
     }
     
+    # Move retrieval out of the measured loop
+    pipeline.warm([english for english, *_ in cases])
+    
+    # Fire all LLM requests concurrently; results come back in input order.
+    # Keyword fast path and autofix are off: the experiment measures the LLM itself.
+    print(f"\n🚀 Running {2 * len(cases)} suggestions concurrently...")
+    no_rag_answers, with_rag_answers = pipeline.suggest_batch(
+        [english for english, *_ in cases], max_retries=1, fast_path=False, autofix=False
+    )
+    
     for i, (english, expected_case, expected_func, explanation) in enumerate(cases, 1):
         print(f"\n[{i}/{len(cases)}] Testing: '{english[:40]}...'")
         print(f"         Expected: {expected_case} + {expected_func}")
         
         # Test WITHOUT RAG
-        suggestion, valid, msg = pipeline.suggest_without_rag(english)
-        got_case = suggestion.get("case", "???")
-        got_func = suggestion.get("function", "???")
+        suggestion, valid, msg = no_rag_answers[i - 1]
+        got_case = suggestion.case
+        got_func = suggestion.function
         
         case_correct = (got_case == expected_case)
         func_correct = (got_func == expected_func)
@@ -103,16 +113,16 @@ def run_experiment(pipeline: CopilotPipeline, num_cases: int = None) -> Dict:
             "valid": valid,
             "case_correct": case_correct,
             "func_correct": func_correct,
-            "reasoning": suggestion.get("reasoning", "")
+            "reasoning": suggestion.reasoning
         })
         
         status = "✅" if fully_correct else ("⚠️" if valid else "❌")
         print(f"         No RAG:  {got_case} + {got_func} {status}")
         
         # Test WITH RAG
-        suggestion, valid, msg, attempts = pipeline.suggest_with_rag(english, max_retries=1)
-        got_case = suggestion.get("case", "???")
-        got_func = suggestion.get("function", "???")
+        suggestion, valid, msg, attempts = with_rag_answers[i - 1]
+        got_case = suggestion.case
+        got_func = suggestion.function
         
         case_correct = (got_case == expected_case)
         func_correct = (got_func == expected_func)
@@ -130,7 +140,7 @@ def run_experiment(pipeline: CopilotPipeline, num_cases: int = None) -> Dict:
             "case_correct": case_correct,
             "func_correct": func_correct,
             "attempts": attempts,
-            "reasoning": suggestion.get("reasoning", "")
+            "reasoning": suggestion.reasoning
         })
         
         status = "✅" if fully_correct else ("⚠️" if valid else "❌")
@@ -178,8 +188,7 @@ def print_summary(results: Dict):
 def save_results(results: Dict, filename: str = "experiment_results.json"):
     """Save full results to JSON"""
     output_path = Path(filename)
-    with open(output_path, 'w') as f:
-        json.dump(results, f, indent=2)
+    output_path.write_bytes(json_dumps_indented(results))
     print(f"\n💾 Full results saved to: {output_path}")
 
 
@@ -198,7 +207,7 @@ if __name__ == "__main__":
     print("Comparing LLM accuracy: Without RAG vs With RAG")
     print("=" * 70)
     
-    pipeline = CopilotPipeline(grammar_file)
+    pipeline = get_pipeline(grammar_file)
     
     results = run_experiment(pipeline, num_cases)
     print_summary(results)
@@ -5,6 +5,7 @@ LLM Client
 Handles all LLM API calls with:
 - Groq (free tier, fast inference)
 - Conversation history management
+- Async single-shot requests for concurrent batches
 - Retry logic
 - Token usage tracking
 """
@@ -16,7 +17,7 @@ from typing import List, Dict, Optional
 from dotenv import load_dotenv
 load_dotenv()  # Load .env from current directory
 
-from groq import Groq
+from groq import Groq, AsyncGroq
 
 
 class LLMClient:
@@ -34,15 +35,19 @@ class LLMClient:
         
         self.api_key = api_key or os.getenv("GROQ_API_KEY")
         self.client = Groq(api_key=self.api_key)
+        self.async_client: Optional[AsyncGroq] = None  # Created lazily inside the event loop
         self.model = "llama-3.3-70b-versatile"  # Best model available for free on Groq
         self.conversation_history: List[Dict] = []
+        self._system_messages: Dict[str, Dict] = {}  # system prompt -> prebuilt message
     
     def chat(
         self, 
         user_message: str,
         system_prompt: Optional[str] = None,
         max_tokens: int = 1000,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        seed: Optional[int] = None,
+        response_format: Optional[Dict] = None
     ) -> str:
         """
         Send a message and get response
@@ -52,16 +57,15 @@ class LLMClient:
             system_prompt: Optional system prompt (only used on first message)
             max_tokens: Max tokens in response
             temperature: Creativity level (0-1)
+            seed: Optional sampling seed (best-effort determinism)
+            response_format: Optional output format, e.g. {"type": "json_object"}
             
         Returns:
             Assistant's response
         """
         # Add system prompt if this is first message
         if not self.conversation_history and system_prompt:
-            self.conversation_history.append({
-                "role": "system",
-                "content": system_prompt
-            })
+            self.conversation_history.append(self._system_message(system_prompt))
         
         # Add user message
         self.conversation_history.append({
@@ -75,7 +79,8 @@ class LLMClient:
                 model=self.model,
                 messages=self.conversation_history,
                 max_tokens=max_tokens,
-                temperature=temperature
+                temperature=temperature,
+                **self._optional_params(seed, response_format)
             )
             
             # Extract response
@@ -92,6 +97,133 @@ class LLMClient:
         except Exception as e:
             return f"Error calling LLM: {str(e)}"
     
+    @staticmethod
+    def _optional_params(seed: Optional[int], response_format: Optional[Dict]) -> Dict:
+        """Request parameters to send only when set (omitted rather than null)"""
+        params = {}
+        if seed is not None:
+            params["seed"] = seed
+        if response_format is not None:
+            params["response_format"] = response_format
+        return params
+    
+    def _system_message(self, system_prompt: str) -> Dict:
+        """Get the system message for a prompt, built once and reused"""
+        system_message = self._system_messages.get(system_prompt)
+        if system_message is None:
+            system_message = {"role": "system", "content": system_prompt}
+            self._system_messages[system_prompt] = system_message
+        return system_message
+    
+    def _build_messages(
+        self,
+        user_message: str,
+        system_prompt: Optional[str],
+        history: Optional[List[Dict]]
+    ) -> List[Dict]:
+        """Build a stateless message list, reusing the prebuilt system message"""
+        messages = []
+        if system_prompt:
+            messages.append(self._system_message(system_prompt))
+        if history:
+            messages.extend(history)
+        messages.append({"role": "user", "content": user_message})
+        return messages
+    
+    def chat_oneshot(
+        self,
+        system_prompt: Optional[str],
+        user_message: str,
+        history: Optional[List[Dict]] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        seed: Optional[int] = None,
+        response_format: Optional[Dict] = None
+    ) -> str:
+        """
+        Send a single stateless request
+        
+        Unlike chat(), does not read or modify conversation_history, so no
+        reset_conversation() is needed between independent requests.
+        
+        Args:
+            system_prompt: Optional system prompt
+            user_message: User's message
+            history: Optional prior messages to send before user_message
+            max_tokens: Max tokens in response
+            temperature: Creativity level (0-1)
+            seed: Optional sampling seed (best-effort determinism)
+            response_format: Optional output format, e.g. {"type": "json_object"}
+            
+        Returns:
+            Assistant's response
+        """
+        messages = self._build_messages(user_message, system_prompt, history)
+        
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                **self._optional_params(seed, response_format)
+            )
+            return response.choices[0].message.content
+            
+        except Exception as e:
+            return f"Error calling LLM: {str(e)}"
+    
+    async def achat(
+        self,
+        user_message: str,
+        system_prompt: Optional[str] = None,
+        history: Optional[List[Dict]] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        seed: Optional[int] = None,
+        response_format: Optional[Dict] = None
+    ) -> str:
+        """
+        Send a stateless message asynchronously (safe to run concurrently)
+        
+        Does not read or modify conversation_history.
+        
+        Args:
+            user_message: User's message
+            system_prompt: Optional system prompt
+            history: Optional prior messages to send before user_message
+            max_tokens: Max tokens in response
+            temperature: Creativity level (0-1)
+            seed: Optional sampling seed (best-effort determinism)
+            response_format: Optional output format, e.g. {"type": "json_object"}
+            
+        Returns:
+            Assistant's response
+        """
+        messages = self._build_messages(user_message, system_prompt, history)
+        
+        if self.async_client is None:
+            self.async_client = AsyncGroq(api_key=self.api_key)
+        
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                **self._optional_params(seed, response_format)
+            )
+            return response.choices[0].message.content
+            
+        except Exception as e:
+            return f"Error calling LLM: {str(e)}"
+    
+    async def aclose(self):
+        """Close the async client (call before its event loop shuts down)"""
+        if self.async_client is not None:
+            await self.async_client.close()
+            self.async_client = None
+    
     def reset_conversation(self):
         """Clear conversation history"""
         self.conversation_history = []
@@ -2,21 +2,36 @@
 RAG System - Semantic Search Over Grammar Rules
 ==============================================
 
-Uses ChromaDB + sentence-transformers for retrieval-augmented generation.
+Uses sentence-transformers + an in-memory NumPy index for retrieval-augmented
+generation (ChromaDB optional).
 """
 
+import functools
+import hashlib
 import json
+import os
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from validators.rule_extractor import load_grammar
 
 try:
     import chromadb
+    import chromadb.errors
     from chromadb.config import Settings
+    # get_collection() on a missing collection: NotFoundError (1.x),
+    # InvalidCollectionException / ValueError (older releases)
+    CHROMA_MISSING_COLLECTION = (ValueError,) + tuple(
+        getattr(chromadb.errors, name)
+        for name in ("NotFoundError", "InvalidCollectionException")
+        if hasattr(chromadb.errors, name)
+    )
     CHROMADB_AVAILABLE = True
 except ImportError:
-    CHROMADB_AVAILABLE = False
-    print("⚠️  ChromaDB not installed. Run: pip install chromadb")
+    CHROMADB_AVAILABLE = False  # Only needed for RAGSystem(use_chromadb=True)
 
 try:
     from sentence_transformers import SentenceTransformer
@@ -25,8 +40,61 @@ except ImportError:
     SENTENCE_TRANSFORMERS_AVAILABLE = False
     print("⚠️  sentence-transformers not installed. Run: pip install sentence-transformers")
 
+try:
+    import simsimd  # SIMD (AVX2/AVX-512/NEON) distance kernels
+    SIMSIMD_AVAILABLE = True
+except ImportError:
+    SIMSIMD_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Below this many rows a single BLAS/SimSIMD call beats thread fan-out
+NUMBA_MIN_ROWS = 1000
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _dot_scores_numba(matrix, query):
+        """Row-parallel dot products of a (N, d) float32 matrix with query"""
+        n, d = matrix.shape
+        scores = np.empty(n, dtype=np.float32)
+        for i in prange(n):
+            s = np.float32(0.0)
+            for j in range(d):
+                s += matrix[i, j] * query[j]
+            scores[i] = s
+        return scores
+
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'  # Fast, lightweight
+# all-MiniLM-L6-v2 truncates at 256 word pieces (~4 chars each); longer text
+# only costs tokenizer time
+EMBED_TEXT_MAX_CHARS = 1024
+EMBED_BATCH_SIZE = 64
+
+# int8-quantized ONNX export shipped in the model repo (needs optimum[onnxruntime])
+EMBEDDING_ONNX_FILE = 'onnx/model_qint8_avx512_vnni.onnx'
+
+
+def quantize_int8(vectors: np.ndarray):
+    """
+    Symmetric int8 quantization with one scale per row
+    
+    Args:
+        vectors: float array, 1-D (one vector) or 2-D (one row per vector)
+        
+    Returns:
+        (int8 array, float32 scale) with vectors ~= q * scale[..., None]
+    """
+    scale = np.abs(vectors).max(axis=-1) / 127.0
+    scale = np.where(scale == 0, 1.0, scale).astype(np.float32)
+    q = np.round(vectors / scale[..., None]).astype(np.int8)
+    return q, scale
+
 
-@dataclass
+@dataclass(slots=True)
 class RetrievedChunk:
     """A grammar chunk retrieved from RAG"""
     case_code: str
@@ -35,6 +103,11 @@ class RetrievedChunk:
     description: str
     citation: str
     score: float  # Similarity score (0-1)
+    # Citation line for validation results, formatted once per chunk
+    summary: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.summary = f"{self.case_name} ({self.semantic_role}): {self.description[:100]}..."
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -54,63 +127,157 @@ class RAGSystem:
     Uses semantic search to find relevant grammar rules based on queries.
     """
     
-    def __init__(self, grammar_file: Path, collection_name: str = "ithkuil_grammar"):
+    def __init__(
+        self,
+        grammar_file: Optional[Path] = None,
+        collection_name: str = "ithkuil_grammar",
+        quantize: bool = False,
+        use_chromadb: bool = False,
+        chunks: Optional[List[Dict[str, Any]]] = None
+    ):
         """
         Initialize RAG system
         
         Args:
-            grammar_file: Path to grammar_chunks.json
+            grammar_file: Path to grammar_chunks.json (also locates the caches)
             collection_name: Name for ChromaDB collection
+            quantize: Score against an int8 copy of the embeddings (4x fewer bytes)
+            use_chromadb: Store and search chunks in a ChromaDB collection
+                instead of the in-memory index (quantize is then unused). The
+                case corpus is small (<100 chunks), so the default exact NumPy
+                search beats an HNSW index
+            chunks: Already-parsed grammar chunks (skips reading grammar_file)
         """
-        if not CHROMADB_AVAILABLE:
-            raise ImportError("ChromaDB required for RAG")
+        if grammar_file is None and chunks is None:
+            raise ValueError("RAGSystem needs grammar_file or chunks")
+        if use_chromadb and grammar_file is None:
+            raise ValueError("use_chromadb=True needs grammar_file (collection location)")
+        if use_chromadb and not CHROMADB_AVAILABLE:
+            raise ImportError("ChromaDB required for use_chromadb=True. Run: pip install chromadb")
         if not SENTENCE_TRANSFORMERS_AVAILABLE:
             raise ImportError("sentence-transformers required for RAG")
         
         self.grammar_file = grammar_file
         self.collection_name = collection_name
+        self.use_chromadb = use_chromadb
+        self._chunks = chunks
+        
+        # Chunk embeddings persisted next to the grammar (see _load_or_embed)
+        self.embeddings_file = grammar_file.with_suffix(".embeddings.npy") if grammar_file else None
+        self.embeddings_meta_file = grammar_file.with_suffix(".embeddings.json") if grammar_file else None
+        self.embeddings: Optional[np.ndarray] = None
+        self.chunk_metadata: List[Dict[str, Any]] = []  # Row-aligned with embeddings
+        self.quantize = quantize
+        self._q8: Optional[np.ndarray] = None
+        self._q8_scale: Optional[np.ndarray] = None
         
         # Initialize embedding model
         print("🔄 Loading embedding model...")
-        self.embedder = SentenceTransformer('all-MiniLM-L6-v2')  # Fast, lightweight
+        self.embedder, self.embedding_backend = self._load_embedder()
+        self.embedding_dim = self.embedder.get_sentence_embedding_dimension()
         print("✅ Embedding model loaded")
         
-        # Initialize ChromaDB
-        self.client = chromadb.Client(Settings(
-            anonymized_telemetry=False,
-            allow_reset=True
-        ))
+        if use_chromadb:
+            # Initialize ChromaDB (persisted, so restarts skip re-embedding)
+            self.client = chromadb.PersistentClient(
+                path=str(grammar_file.parent / ".chroma"),
+                settings=Settings(anonymized_telemetry=False)
+            )
+            
+            # Load or create collection
+            self.collection = self._initialize_collection()
+        else:
+            self.client = None
+            self.collection = None
+            self._build_index(self._load_grammar_chunks())
         
-        # Load or create collection
-        self.collection = self._initialize_collection()
+        # Exact case-code lookups (validation hot path) never need a search
+        metadatas = self.chunk_metadata or [
+            self._chunk_metadata(chunk) for chunk in self._load_grammar_chunks()
+        ]
+        self._case_index: Dict[str, RetrievedChunk] = {
+            m['code']: self._chunk_from_metadata(m, 1.0) for m in metadatas
+        }
+        
+        # Repeated text queries skip the embedder and the search
+        self._retrieve_by_text = functools.lru_cache(maxsize=256)(self._retrieve_by_text)
+        
+        print(f"✅ RAG system ready with {self.count()} chunks")
+    
+    @classmethod
+    def from_chunks(
+        cls,
+        chunks: List[Dict[str, Any]],
+        grammar_file: Optional[Path] = None,
+        **kwargs
+    ) -> "RAGSystem":
+        """
+        Build from already-parsed grammar chunks
+        
+        Args:
+            chunks: Grammar chunk dicts (e.g. from load_grammar)
+            grammar_file: Source file, only used to locate the caches
+            **kwargs: Passed to RAGSystem()
+        """
+        return cls(grammar_file, chunks=chunks, **kwargs)
+    
+    @staticmethod
+    def _load_embedder():
+        """
+        Load the embedding model, preferring the quantized ONNX backend
         
-        print(f"✅ RAG system ready with {self.collection.count()} chunks")
+        Returns:
+            (SentenceTransformer, backend name) - falls back to PyTorch
+        """
+        try:
+            embedder = SentenceTransformer(
+                EMBEDDING_MODEL,
+                backend='onnx',
+                model_kwargs={'file_name': EMBEDDING_ONNX_FILE}
+            )
+            return embedder, 'onnx'
+        except Exception as e:  # Missing optimum/onnxruntime raises a bare Exception
+            print(f"⚠️  ONNX backend unavailable ({e}), using PyTorch")
+            return SentenceTransformer(EMBEDDING_MODEL), 'torch'
     
     def _initialize_collection(self):
-        """Load grammar chunks into ChromaDB"""
+        """Load grammar chunks into ChromaDB (rebuilt when the grammar changes)"""
+        grammar_hash = hashlib.sha256(self.grammar_file.read_bytes()).hexdigest()[:16]
+        
         # Try to get existing collection
         try:
             collection = self.client.get_collection(self.collection_name)
-            print(f"📚 Loaded existing collection: {collection.count()} chunks")
-            return collection
-        except:
-            # Create new collection
-            print("🔄 Creating new collection...")
-            collection = self.client.create_collection(
-                name=self.collection_name,
-                metadata={"description": "Ithkuil grammar rules"}
-            )
-            
-            # Load and embed grammar chunks
-            chunks = self._load_grammar_chunks()
-            self._embed_and_store(chunks, collection)
-            
-            return collection
+        except CHROMA_MISSING_COLLECTION:
+            collection = None  # Anything else propagates rather than forcing a re-embed
+        
+        if collection is not None:
+            metadata = collection.metadata or {}
+            if metadata.get("grammar_hash") == grammar_hash and metadata.get("hnsw:space") == "cosine":
+                print(f"📚 Loaded existing collection: {collection.count()} chunks")
+                return collection
+            print("🔄 Grammar changed, rebuilding collection...")
+            self.client.delete_collection(self.collection_name)
+        
+        # Create new collection
+        print("🔄 Creating new collection...")
+        collection = self.client.create_collection(
+            name=self.collection_name,
+            metadata={
+                "description": "Ithkuil grammar rules",
+                "grammar_hash": grammar_hash,
+                "hnsw:space": "cosine"
+            }
+        )
+        
+        # Load and embed grammar chunks
+        chunks = self._load_grammar_chunks()
+        self._embed_and_store(chunks, collection)
+        
+        return collection
     
     def _load_grammar_chunks(self) -> List[Dict[str, Any]]:
-        """Load grammar chunks from JSON"""
-        with open(self.grammar_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        """Load grammar chunks from JSON (shared, cached parse)"""
+        data = self._chunks if self._chunks is not None else load_grammar(self.grammar_file)
         
         # Filter to only cases (most important for validation)
         cases = [item for item in data if item.get('type') == 'case']
@@ -119,8 +286,29 @@ class RAGSystem:
     
     def _embed_and_store(self, chunks: List[Dict], collection):
         """Embed chunks and store in ChromaDB"""
-        print(f"🔄 Embedding {len(chunks)} chunks...")
+        documents, embeddings, ids = self._build_index(chunks)
+        
+        # Store in ChromaDB
+        collection.add(
+            embeddings=np.asarray(embeddings, dtype=np.float32),  # ndarray, no Python-float lists
+            documents=documents,
+            metadatas=self.chunk_metadata,
+            ids=ids
+        )
         
+        print(f"✅ Stored {len(chunks)} chunks in ChromaDB")
+        
+        # Chroma serves the searches; don't also hold the dense matrix
+        self.embeddings = None
+        self._q8 = self._q8_scale = None
+    
+    def _build_index(self, chunks: List[Dict]):
+        """
+        Embed chunks into the in-memory index
+        
+        Returns:
+            (documents, embeddings, ids), row-aligned with chunk_metadata
+        """
         documents = []
         metadatas = []
         ids = []
@@ -132,34 +320,134 @@ class RAGSystem:
                 # Fallback: combine key fields
                 embed_text = f"{chunk['name']} {chunk['code']} {chunk.get('semantic_role', '')} {chunk.get('description', '')}"
             
-            documents.append(embed_text)
-            metadatas.append({
-                "code": chunk['code'],
-                "name": chunk['name'],
-                "semantic_role": chunk.get('semantic_role', ''),
-                "description": chunk.get('description', '')[:200],  # Truncate
-                "citation": chunk.get('citation', ''),
-            })
+            documents.append(embed_text[:EMBED_TEXT_MAX_CHARS])
+            metadatas.append(self._chunk_metadata(chunk))
             ids.append(chunk['id'])
         
-        # Embed all at once (faster)
-        embeddings = self.embedder.encode(documents, show_progress_bar=True)
+        embeddings = self._load_or_embed(documents)
+        self.chunk_metadata = metadatas
+        if self.quantize:
+            self._q8, self._q8_scale = quantize_int8(embeddings)
         
-        # Store in ChromaDB
-        collection.add(
-            embeddings=embeddings.tolist(),
-            documents=documents,
-            metadatas=metadatas,
-            ids=ids
+        return documents, embeddings, ids
+    
+    @staticmethod
+    def _chunk_metadata(chunk: Dict[str, Any]) -> Dict[str, Any]:
+        """Metadata stored per chunk (and used to build RetrievedChunk)"""
+        return {
+            "code": chunk['code'],
+            "name": chunk['name'],
+            "semantic_role": chunk.get('semantic_role', ''),
+            "description": chunk.get('description', '')[:200],  # Truncate
+            "citation": chunk.get('citation', ''),
+        }
+    
+    def _embeddings_fingerprint(self) -> str:
+        """Hash of grammar content + model/backend, invalidates the persisted embeddings"""
+        digest = hashlib.sha1(self.grammar_file.read_bytes())
+        digest.update(f"{EMBEDDING_MODEL}:{self.embedding_backend}:{EMBED_TEXT_MAX_CHARS}".encode())
+        return digest.hexdigest()
+    
+    def _load_or_embed(self, documents: List[str]) -> np.ndarray:
+        """
+        Load chunk embeddings from disk, or embed and persist them
+        
+        The matrix is memory-mapped read-only, so later runs skip the
+        embedding forward pass and processes share the pages. Without a
+        grammar_file nothing is persisted.
+        
+        Args:
+            documents: Embedding texts, in chunk order
+            
+        Returns:
+            (len(documents), embedding_dim) float32 array of L2-normalized rows
+        """
+        fingerprint = self._embeddings_fingerprint() if self.embeddings_file else None
+        
+        if fingerprint:
+            try:
+                with open(self.embeddings_meta_file, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                if meta.get("fingerprint") == fingerprint and meta.get("count") == len(documents):
+                    embeddings = np.load(self.embeddings_file, mmap_mode='r')
+                    # A matrix from another writer can pass the metadata check
+                    if embeddings.shape == (len(documents), self.embedding_dim) and embeddings.dtype == np.float32:
+                        self.embeddings = embeddings
+                        print(f"📂 Loaded {len(documents)} cached embeddings")
+                        return self.embeddings
+            except (OSError, ValueError):
+                pass  # Missing or corrupt cache - re-embed
+        
+        print(f"🔄 Embedding {len(documents)} chunks...")
+        
+        # Embed all at once (encode sorts by length, so batches pad little)
+        embeddings = self.embedder.encode(
+            documents,
+            batch_size=EMBED_BATCH_SIZE,
+            show_progress_bar=len(documents) > 256,  # tqdm is overhead for small corpora
+            normalize_embeddings=True,
+            convert_to_numpy=True
         )
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        self.embeddings = embeddings
+        if not fingerprint:
+            return embeddings
         
-        print(f"✅ Stored {len(chunks)} chunks in ChromaDB")
+        # Write atomically: matrix first, then the metadata that validates it
+        tmp_file = self.embeddings_file.with_name(self.embeddings_file.name + ".tmp")
+        tmp_meta = self.embeddings_meta_file.with_name(self.embeddings_meta_file.name + ".tmp")
+        try:
+            with open(tmp_file, 'wb') as f:
+                np.save(f, embeddings)
+            os.replace(tmp_file, self.embeddings_file)
+            
+            with open(tmp_meta, 'w', encoding='utf-8') as f:
+                json.dump({"fingerprint": fingerprint, "model": EMBEDDING_MODEL, "count": len(documents)}, f)
+            os.replace(tmp_meta, self.embeddings_meta_file)
+        except OSError as e:
+            # Read-only data dir: the in-memory matrix still serves this run
+            print(f"⚠️  Could not persist embeddings: {e}")
+        
+        return embeddings
+    
+    def embed(self, text: str) -> np.ndarray:
+        """
+        Embed a query string
+        
+        Args:
+            text: Text to embed
+            
+        Returns:
+            L2-normalized float32 vector (dot product == cosine similarity)
+        """
+        return self.embedder.encode(
+            text,
+            normalize_embeddings=True,
+            convert_to_numpy=True
+        ).astype(np.float32, copy=False)
+    
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed many query strings in one batched forward pass
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            (len(texts), embedding_dim) float32 array of L2-normalized rows
+        """
+        return self.embedder.encode(
+            texts,
+            normalize_embeddings=True,
+            convert_to_numpy=True
+        ).astype(np.float32, copy=False)
     
     def retrieve(
         self,
         query: str,
         n_results: int = 3,
-        filter_case: Optional[str] = None
+        filter_case: Optional[str] = None,
+        query_embedding: Optional[np.ndarray] = None
     ) -> List[RetrievedChunk]:
         """
         Retrieve relevant grammar chunks
@@ -168,16 +456,48 @@ class RAGSystem:
             query: Semantic query (e.g., "unwilled experience")
             n_results: Number of results to return
             filter_case: Optional case code to filter by
+            query_embedding: Precomputed embedding of query (skips re-embedding)
             
         Returns:
             List of retrieved chunks with similarity scores
         """
+        if query_embedding is None:
+            return list(self._retrieve_by_text(query, n_results, filter_case))
+        return self._search(query, n_results, filter_case, query_embedding)
+    
+    def _retrieve_by_text(
+        self,
+        query: str,
+        n_results: int,
+        filter_case: Optional[str]
+    ) -> Tuple[RetrievedChunk, ...]:
+        """retrieve() for a text query; wrapped in an LRU cache per instance"""
+        return tuple(self._search(query, n_results, filter_case, None))
+    
+    def _search(
+        self,
+        query: str,
+        n_results: int,
+        filter_case: Optional[str],
+        query_embedding: Optional[np.ndarray]
+    ) -> List[RetrievedChunk]:
+        """Run the dense or Chroma search (see retrieve)"""
+        # Unit-length query: cosine similarity is a plain dot product
+        if query_embedding is None:
+            query_embedding = self.embed(query)
+        
+        # In-process index: one matrix-vector product instead of a Chroma query.
+        # With use_chromadb=True every search goes to the collection, whether
+        # it was just built or loaded from disk
+        if self.collection is None:
+            return self._retrieve_dense(query_embedding, n_results, filter_case)
+        
         # Build query
         where = {"code": filter_case} if filter_case else None
         
         # Query ChromaDB
         results = self.collection.query(
-            query_texts=[query],
+            query_embeddings=np.asarray(query_embedding, dtype=np.float32)[None, :],
             n_results=n_results,
             where=where
         )
@@ -189,20 +509,79 @@ class RAGSystem:
                 metadata = results['metadatas'][0][i]
                 distance = results['distances'][0][i]
                 
-                # Convert distance to similarity score (1 = perfect match, 0 = no match)
-                score = 1.0 - (distance / 2.0)  # Normalize L2 distance
+                # Cosine space: distance = 1 - cosine similarity
+                score = 1.0 - distance
                 
-                chunks.append(RetrievedChunk(
-                    case_code=metadata['code'],
-                    case_name=metadata['name'],
-                    semantic_role=metadata['semantic_role'],
-                    description=metadata['description'],
-                    citation=metadata['citation'],
-                    score=max(0.0, min(1.0, score))  # Clamp to [0, 1]
-                ))
+                chunks.append(self._chunk_from_metadata(metadata, score))
         
         return chunks
     
+    def _retrieve_dense(
+        self,
+        query_embedding: np.ndarray,
+        n_results: int,
+        filter_case: Optional[str] = None
+    ) -> List[RetrievedChunk]:
+        """
+        Top-k cosine search over the in-memory embedding matrix
+        
+        Rows and query are unit vectors, so cosine is one float32 GEMV
+        (SimSIMD's cosine kernel when installed, a parallel Numba kernel for
+        corpora of NUMBA_MIN_ROWS+ chunks) and argpartition selects the
+        top-k without sorting every score. With quantize=True the GEMV runs
+        on int8 rows with int32 accumulation (SimSIMD's i8 cosine kernel,
+        VNNI where available, when installed).
+        """
+        rows = np.arange(len(self.chunk_metadata))
+        if filter_case:
+            rows = rows[[m['code'] == filter_case for m in self.chunk_metadata]]
+        if len(rows) == 0 or n_results <= 0:
+            return []
+        
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if self._q8 is not None:
+            # int16 would overflow: d * 127 * 127 exceeds 32767 for d > 2
+            q8, q_scale = quantize_int8(query)
+            matrix = self._q8[rows] if filter_case else self._q8
+            if SIMSIMD_AVAILABLE:
+                # Cosine is scale-invariant, so the per-row scales cancel out
+                distances = simsimd.cdist(q8[None, :], matrix, metric='cosine')
+                scores = 1.0 - np.asarray(distances, dtype=np.float32)[0]
+            else:
+                row_scale = self._q8_scale[rows] if filter_case else self._q8_scale
+                scores = (matrix.astype(np.int32) @ q8.astype(np.int32)).astype(np.float32)
+                scores *= row_scale * q_scale
+        else:
+            matrix = self.embeddings[rows] if filter_case else self.embeddings
+            if NUMBA_AVAILABLE and len(rows) >= NUMBA_MIN_ROWS:
+                scores = _dot_scores_numba(np.asarray(matrix), query)
+            elif SIMSIMD_AVAILABLE:
+                distances = simsimd.cdist(query[None, :], matrix, metric='cosine')
+                scores = 1.0 - np.asarray(distances, dtype=np.float32)[0]
+            else:
+                scores = matrix @ query
+        
+        k = min(n_results, len(rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        
+        return [
+            self._chunk_from_metadata(self.chunk_metadata[rows[i]], float(scores[i]))
+            for i in top
+        ]
+    
+    @staticmethod
+    def _chunk_from_metadata(metadata: Dict[str, Any], score: float) -> RetrievedChunk:
+        """Build a RetrievedChunk from stored chunk metadata"""
+        return RetrievedChunk(
+            case_code=metadata['code'],
+            case_name=metadata['name'],
+            semantic_role=metadata['semantic_role'],
+            description=metadata['description'],
+            citation=metadata['citation'],
+            score=max(0.0, min(1.0, score))  # Clamp to [0, 1]
+        )
+    
     def retrieve_for_case(self, case_code: str) -> Optional[RetrievedChunk]:
         """
         Retrieve specific case information
@@ -213,6 +592,13 @@ class RAGSystem:
         Returns:
             Case information or None if not found
         """
+        # O(1) exact-code lookup, no embedding; the in-memory index holds
+        # exactly these chunks, so a miss there is final
+        chunk = self._case_index.get(case_code)
+        if chunk is not None or self.collection is None:
+            return chunk
+        
+        # A persisted Chroma collection may hold codes the index lacks
         chunks = self.retrieve(
             query=case_code,
             n_results=1,
@@ -220,12 +606,19 @@ class RAGSystem:
         )
         return chunks[0] if chunks else None
     
+    def count(self) -> int:
+        """Number of indexed chunks"""
+        if self.collection is not None:
+            return self.collection.count()
+        return len(self.chunk_metadata)
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get RAG system statistics"""
         return {
-            "total_chunks": self.collection.count(),
-            "embedding_model": "all-MiniLM-L6-v2",
-            "embedding_dim": 384,
+            "total_chunks": self.count(),
+            "embedding_model": EMBEDDING_MODEL,
+            "embedding_backend": self.embedding_backend,
+            "embedding_dim": self.embedding_dim,
             "collection_name": self.collection_name
         }
 
@@ -6,8 +6,9 @@ The ValidationEngine has absolute veto power over all system output.
 This is the co-pilot pattern: LLM suggests, validator decides.
 """
 
+import functools
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from enum import Enum
 from pathlib import Path
 
@@ -15,6 +16,23 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent))
 from rag_system import RAGSystem
 
+VALID_FUNCTIONS = frozenset({"STA", "DYN", "MNF"})
+
+# LLMs often answer with the semantic role where the function belongs
+ROLE_TO_FUNCTION = {
+    "EXPERIENCER": "STA",
+    "AGENT": "DYN",
+    "INSTRUMENT": "DYN",
+    "PATIENT": "STA",
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _case_format_ok(case: str) -> bool:
+    """Case codes are 3 uppercase letters (memoized: the same codes recur)"""
+    return len(case) == 3 and case.isupper() and case.isalpha()
+
+
 class ValidationLevel(Enum):
     """Levels of validation strictness"""
     STRUCTURE = "structure"      # Phonological + slot completeness
@@ -22,7 +40,7 @@ class ValidationLevel(Enum):
     SEMANTIC = "semantic"        # RAG citation required
     
 
-@dataclass
+@dataclass(slots=True)
 class ValidationError:
     """A validation failure with explanation"""
     level: ValidationLevel
@@ -31,7 +49,7 @@ class ValidationError:
     suggestion: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationResult:
     """Result of validation check"""
     passed: bool
@@ -40,6 +58,16 @@ class ValidationResult:
     citations: List[str]
     needs_clarification: bool = False
     
+    def copy(self) -> "ValidationResult":
+        """Copy with its own errors/citations lists (error objects are shared)"""
+        return ValidationResult(
+            passed=self.passed,
+            confidence=self.confidence,
+            errors=list(self.errors),
+            citations=list(self.citations),
+            needs_clarification=self.needs_clarification
+        )
+    
     def __repr__(self):
         status = "✅ VALID" if self.passed else "❌ INVALID"
         return f"{status} (confidence={self.confidence:.2f}, {len(self.errors)} errors)"
@@ -58,36 +86,47 @@ class ValidationEngine:
     This pattern generalizes to any domain where correctness > fluency.
     """
     
-    def __init__(self, grammar_kb: Dict[str, Any], grammar_file: Optional[Path] = None):
+    def __init__(
+        self,
+        grammar_kb: Dict[str, Any],
+        grammar_file: Optional[Path] = None,
+        rag: Optional[RAGSystem] = None
+    ):
         """
         Initialize validation engine with grammar knowledge base
         
         Args:
             grammar_kb: Structured grammar rules and constraints
             grammar_file: Path to grammar JSON for rule extraction
+            rag: Existing RAGSystem to reuse instead of building another index
         """
         self.grammar_kb = grammar_kb
-        self.stats = {
-            "total_validations": 0,
-            "passed": 0,
-            "rejected": 0,
-            "clarification_needed": 0
-        }
+        self.reset_stats()
+        
+        # Results depend only on (case, function) once rules/RAG are loaded;
+        # per-instance so engines with different rules never share entries
+        self._validate_pair = functools.lru_cache(maxsize=1024)(self._evaluate_pair)
         
         # Load real cooccurrence rules from grammar data
         self.cooccurrence_rules = None
-        self.rag = None
+        self.rag = rag
         
         if grammar_file and grammar_file.exists():
             try:
                 # Import here to avoid circular dependencies
                 from validators.cooccurrence_rules import CooccurrenceRules
+                from validators.rule_extractor import load_grammar
+                
+                # Engines on the same file share one extractor (RuleExtractor.from_file),
+                # which only parses the grammar if the .rules.pkl cache misses
                 self.cooccurrence_rules = CooccurrenceRules(grammar_file)
                 print(f"✅ ValidationEngine loaded with {len(self.cooccurrence_rules.constraints)} case rules")
                 
-                # Initialize RAG system
-                self.rag = RAGSystem(grammar_file)
-                print(f"✅ RAG system initialized")
+                # Initialize RAG system (unless the caller shares one); load_grammar
+                # returns the same cached parse the extractor uses
+                if self.rag is None:
+                    self.rag = RAGSystem.from_chunks(load_grammar(grammar_file), grammar_file)
+                    print(f"✅ RAG system initialized")
                 
             except Exception as e:
                 print(f"⚠️  Failed to load rules/RAG: {e}")
@@ -105,8 +144,56 @@ class ValidationEngine:
         Returns:
             ValidationResult with pass/fail and detailed errors
         """
+        result = self._evaluate_cached(semantic_json)
+        self._record(result)
+        return result
+    
+    def validate_batch(self, items: List[Dict[str, Any]]) -> List[ValidationResult]:
+        """
+        Validate many semantic JSONs, checking each distinct (case, function) once
+        
+        Validation depends only on case and function, so duplicates reuse the
+        memoized evaluation (and its citation lookup). Stats count every item.
+        
+        Args:
+            items: Semantic representations to validate
+            
+        Returns:
+            One ValidationResult per item, in input order
+        """
+        results = []
+        for item in items:
+            result = self._evaluate_cached(item)
+            self._record(result)
+            results.append(result)
+        return results
+    
+    def _record(self, result: ValidationResult):
+        """Count one validation outcome in self.stats"""
         self.stats["total_validations"] += 1
+        if not result.passed:
+            self.stats["rejected"] += 1
+            return
         
+        # Low-confidence passes are still passes, flagged for review
+        if result.needs_clarification:
+            self.stats["clarification_needed"] += 1
+        self.stats["passed"] += 1
+    
+    def _evaluate_cached(self, semantic_json: Dict[str, Any]) -> ValidationResult:
+        """_evaluate, memoized on string (case, function); returns a private copy"""
+        case = semantic_json.get("case")
+        function = semantic_json.get("function")
+        if not (isinstance(case, str) and isinstance(function, str)):
+            return self._evaluate(semantic_json)  # Missing/non-string: error paths, not cached
+        return self._validate_pair(case, function).copy()
+    
+    def _evaluate_pair(self, case: str, function: str) -> ValidationResult:
+        """Evaluate one (case, function) pair; wrapped in an LRU cache by __init__"""
+        return self._evaluate({"case": case, "function": function})
+    
+    def _evaluate(self, semantic_json: Dict[str, Any]) -> ValidationResult:
+        """Run all validation levels (no stats bookkeeping)"""
         errors = []
         confidence = 1.0
         citations = []
@@ -115,7 +202,6 @@ class ValidationEngine:
         structure_errors = self._validate_structure(semantic_json)
         errors.extend(structure_errors)
         if structure_errors:
-            self.stats["rejected"] += 1
             return ValidationResult(
                 passed=False,
                 confidence=0.0,
@@ -127,7 +213,6 @@ class ValidationEngine:
         coherence_errors = self._validate_coherence(semantic_json)
         errors.extend(coherence_errors)
         if coherence_errors:
-            self.stats["rejected"] += 1
             return ValidationResult(
                 passed=False,
                 confidence=0.0,
@@ -145,7 +230,6 @@ class ValidationEngine:
         # Low confidence without errors = pass with warning (extensibility)
         # Low confidence with errors = fail
         if errors:
-            self.stats["rejected"] += 1
             return ValidationResult(
                 passed=False,
                 confidence=confidence,
@@ -154,9 +238,7 @@ class ValidationEngine:
             )
         
         if confidence < 0.85:
-            self.stats["clarification_needed"] += 1
             # Still passes, but flagged for review
-            self.stats["passed"] += 1
             return ValidationResult(
                 passed=True,
                 confidence=confidence,
@@ -165,7 +247,6 @@ class ValidationEngine:
                 needs_clarification=True
             )
         
-        self.stats["passed"] += 1
         return ValidationResult(
             passed=True,
             confidence=confidence,
@@ -173,6 +254,45 @@ class ValidationEngine:
             citations=citations
         )
     
+    def try_autofix(self, suggestion: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], ValidationResult]]:
+        """
+        Repair mechanical mistakes in a rejected suggestion without the LLM
+        
+        Maps semantic roles given as the function (EXPERIENCER -> STA, ...)
+        and forces the function when the case allows exactly one
+        (e.g. AFF -> STA).
+        
+        Args:
+            suggestion: The semantic representation that failed validation
+            
+        Fix attempts are not counted as validations; successful fixes are
+        counted in stats["autofixed"].
+        
+        Returns:
+            (fixed_suggestion, result) if the fix validates, else None
+        """
+        case = suggestion.get("case")
+        function = suggestion.get("function")
+        if not isinstance(case, str) or not isinstance(function, str):
+            return None
+        
+        function = ROLE_TO_FUNCTION.get(function.upper(), function)
+        
+        if self.cooccurrence_rules and case in self.cooccurrence_rules.constraints:
+            allowed = self.cooccurrence_rules.get_allowed_functions(case)
+            if len(allowed) == 1 and function not in allowed:
+                function = next(iter(allowed))
+        
+        if function == suggestion.get("function"):
+            return None  # Nothing mechanical to fix
+        
+        fixed = {**suggestion, "function": function}
+        result = self._evaluate_cached(fixed)
+        if not result.passed:
+            return None
+        self.stats["autofixed"] += 1
+        return fixed, result
+    
     def _validate_structure(self, semantic_json: Dict[str, Any]) -> List[ValidationError]:
         """
         Validate phonological structure and slot completeness
@@ -216,19 +336,22 @@ class ValidationEngine:
             ))
             return errors
         
+        # Match the interned codes in the rule tables (identity compare on lookup)
+        case = sys.intern(case)
+        function = sys.intern(function)
+        
         # Check if function is valid
-        valid_functions = {"STA", "DYN", "MNF"}
-        if function not in valid_functions:
+        if function not in VALID_FUNCTIONS:
             errors.append(ValidationError(
                 level=ValidationLevel.COHERENCE,
-                message=f"Invalid function '{function}'. Must be one of: {', '.join(sorted(valid_functions))}",
+                message=f"Invalid function '{function}'. Must be one of: {', '.join(sorted(VALID_FUNCTIONS))}",
                 slot="function",
                 suggestion="Use STA for states or DYN for actions"
             ))
             return errors  # Don't continue if function is invalid
         
         # Check case format (must be 3 uppercase letters)
-        if not (len(case) == 3 and case.isupper() and case.isalpha()):
+        if not _case_format_ok(case):
             errors.append(ValidationError(
                 level=ValidationLevel.COHERENCE,
                 message=f"Invalid case format '{case}'. Cases are 3-letter uppercase codes like AFF, ERG, ABS",
@@ -238,18 +361,16 @@ class ValidationEngine:
             return errors
         
         # Check co-occurrence rules if we have them
-        if self.cooccurrence_rules:
-            # Only validate if case is known - unknown cases pass (extensibility)
-            if case in self.cooccurrence_rules.constraints:
-                is_valid, error_msg = self.cooccurrence_rules.check_case_function(case, function)
-                if not is_valid:
-                    allowed = self.cooccurrence_rules.get_allowed_functions(case)
-                    errors.append(ValidationError(
-                        level=ValidationLevel.COHERENCE,
-                        message=error_msg,
-                        slot="case+function",
-                        suggestion=f"Try one of: {', '.join(sorted(allowed))}"
-                    ))
+        # (unknown cases pass for extensibility; messages only built on rejection)
+        if self.cooccurrence_rules and not self.cooccurrence_rules.fast_check(case, function):
+            _, error_msg = self.cooccurrence_rules.check_case_function(case, function)
+            allowed = self.cooccurrence_rules.get_allowed_functions(case)
+            errors.append(ValidationError(
+                level=ValidationLevel.COHERENCE,
+                message=error_msg,
+                slot="case+function",
+                suggestion=f"Try one of: {', '.join(sorted(allowed))}"
+            ))
         
         return errors
        
@@ -274,10 +395,8 @@ class ValidationEngine:
                 # Confidence comes from validation passing, not retrieval score
                 citations.append(result.citation)
                 
-                # Add semantic role info
-                citations.append(
-                    f"{result.case_name} ({result.semantic_role}): {result.description[:100]}..."
-                )
+                # Add semantic role info (preformatted on the chunk)
+                citations.append(result.summary)
                 
                 # High confidence - case found in grammar
                 confidence = 0.95
@@ -296,6 +415,16 @@ class ValidationEngine:
             "citations": citations
         }
     
+    def reset_stats(self):
+        """Zero the validation counters (rules and RAG stay loaded)"""
+        self.stats = {
+            "total_validations": 0,
+            "passed": 0,
+            "rejected": 0,
+            "clarification_needed": 0,
+            "autofixed": 0
+        }
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get validation statistics"""
         total = self.stats["total_validations"]
@@ -1,5 +1,10 @@
 """Validation subsystem"""
 from .cooccurrence_rules import CooccurrenceRules
-from .rule_extractor import RuleExtractor, CaseConstraints
+from .rule_extractor import (
+    RuleExtractor, CaseConstraints, load_grammar, json_loads, json_dumps_indented
+)
 
-__all__ = ['CooccurrenceRules', 'RuleExtractor', 'CaseConstraints']
\ No newline at end of file
+__all__ = [
+    'CooccurrenceRules', 'RuleExtractor', 'CaseConstraints', 'load_grammar',
+    'json_loads', 'json_dumps_indented'
+]
\ No newline at end of file
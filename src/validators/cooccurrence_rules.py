@@ -5,9 +5,14 @@ Cooccurrence Rules - Smart Validation Logic
 Loads and applies grammatical constraints from extracted rules.
 """
 
-from typing import Dict, Optional, Set, Tuple, List
+import os
+import pickle
+import sys
+from typing import Any, Dict, FrozenSet, Optional, Sequence, Tuple, List
 from pathlib import Path
 
+import numpy as np
+
 # Handle both relative and absolute imports
 try:
     from .rule_extractor import RuleExtractor, CaseConstraints
@@ -15,6 +20,9 @@ except ImportError:
     # Running as script
     from rule_extractor import RuleExtractor, CaseConstraints
 
+# Bump when CaseConstraints' layout changes so stale .rules.pkl files are rebuilt
+RULES_CACHE_VERSION = 3
+
 class CooccurrenceRules:
     """
     Manages case-function compatibility rules
@@ -23,22 +31,118 @@ class CooccurrenceRules:
     Rules are extracted from grammar data based on semantic roles.
     """
     
-    def __init__(self, grammar_file: Path):
+    def __init__(self, grammar_file: Optional[Path] = None, chunks: Optional[List[Dict[str, Any]]] = None):
         """
         Load rules from grammar data
         
         Args:
             grammar_file: Path to grammar data JSON
+            chunks: Already-parsed grammar chunks (skips reading grammar_file)
         """
         self.grammar_file = grammar_file
-        self.extractor = RuleExtractor(grammar_file)
-        self.constraints = self.extractor.extract_case_constraints()
+        if chunks is not None:
+            self.extractor = RuleExtractor.from_chunks(chunks, grammar_file)
+        else:
+            self.extractor = RuleExtractor.from_file(grammar_file)
+        self.constraints = self._load_or_extract_constraints()
+        
+        # Hot-path lookup tables (see fast_check)
+        self._known_cases = frozenset(self.constraints)
+        self._valid_pairs = RuleExtractor.allowed_pairs(self.constraints)
+        
+        # Bulk truth table (see fast_check_batch): one row per known case plus
+        # a fail-open row for unknown cases; last column is "unknown function"
+        self._case_rows = {case: row for row, case in enumerate(self.constraints)}
+        self._function_cols = {"STA": 0, "DYN": 1, "MNF": 2}
+        self._pair_table = np.zeros((len(self._case_rows) + 1, len(self._function_cols) + 1), dtype=bool)
+        for case, function in self._valid_pairs:
+            self._pair_table[self._case_rows[case], self._function_cols[function]] = True
+        self._pair_table[-1, :] = True
+        
+        source = grammar_file.name if grammar_file else "grammar chunks"
+        print(f"✅ Loaded {len(self.constraints)} case rules from {source}")
+    
+    def _rules_cache_key(self) -> Tuple:
+        """Grammar file identity + role table; any change invalidates the cache"""
+        stat = self.grammar_file.stat()
+        role_rules = sorted(
+            (role, sorted(rules["allowed"]), sorted(rules["forbidden"]))
+            for role, rules in RuleExtractor.ROLE_FUNCTION_RULES.items()
+        )
+        return (RULES_CACHE_VERSION, stat.st_mtime_ns, stat.st_size, repr(role_rules))
+    
+    def _load_or_extract_constraints(self) -> Dict[str, CaseConstraints]:
+        """
+        Load extracted constraints from the .rules.pkl cache, or extract,
+        validate and cache them
+        
+        Without a grammar_file (chunks only) nothing is cached.
+        """
+        cache_file = self.grammar_file.with_suffix(".rules.pkl") if self.grammar_file else None
+        key = None
+        
+        if cache_file:
+            key = self._rules_cache_key()
+            try:
+                with open(cache_file, 'rb') as f:
+                    payload = pickle.load(f)
+                if payload.get("key") == key:
+                    # Unpickled strings are not interned; re-intern the case codes
+                    return {sys.intern(code): c for code, c in payload["constraints"].items()}
+            except (OSError, pickle.UnpicklingError, EOFError, ImportError, AttributeError, TypeError):
+                pass  # Missing, corrupt, or pickled under another module path/layout
+        
+        constraints = self.extractor.extract_case_constraints()
         
         # Validate on load
         if not self.extractor.validate_rules():
             raise ValueError("Inconsistent rules detected in grammar data")
         
-        print(f"✅ Loaded {len(self.constraints)} case rules from {grammar_file.name}")
+        if cache_file:
+            tmp_file = cache_file.with_suffix(".tmp")
+            try:
+                with open(tmp_file, 'wb') as f:
+                    pickle.dump({"key": key, "constraints": constraints}, f)
+                os.replace(tmp_file, cache_file)
+            except OSError as e:
+                print(f"⚠️  Could not cache extracted rules: {e}")
+        
+        return constraints
+    
+    @classmethod
+    def from_chunks(cls, chunks: List[Dict[str, Any]], grammar_file: Optional[Path] = None) -> "CooccurrenceRules":
+        """Build from already-parsed grammar chunks (no file read)"""
+        return cls(grammar_file, chunks=chunks)
+    
+    def fast_check(self, case: str, function: str) -> bool:
+        """
+        Same verdict as check_case_function, without building the error message
+        
+        Unknown cases pass (fail open), matching check_case_function.
+        """
+        return case not in self._known_cases or (case, function) in self._valid_pairs
+    
+    def fast_check_batch(self, cases: Sequence[str], functions: Sequence[str]) -> np.ndarray:
+        """
+        fast_check over many pairs at once
+        
+        Codes are mapped to table indices, then every verdict comes from a
+        single vectorised NumPy gather.
+        
+        Args:
+            cases: Case abbreviations
+            functions: Function abbreviations, aligned with cases
+            
+        Returns:
+            Boolean array, True where the pair may co-occur
+        """
+        unknown_case = len(self._case_rows)
+        unknown_function = len(self._function_cols)
+        rows = np.fromiter((self._case_rows.get(c, unknown_case) for c in cases),
+                           dtype=np.intp, count=len(cases))
+        cols = np.fromiter((self._function_cols.get(f, unknown_function) for f in functions),
+                           dtype=np.intp, count=len(functions))
+        return self._pair_table[rows, cols]
     
     def check_case_function(self, case: str, function: str) -> Tuple[bool, Optional[str]]:
         """
@@ -51,12 +155,11 @@ class CooccurrenceRules:
         Returns:
             (is_valid, error_message)
         """
-        if case not in self.constraints:
+        if case not in self._known_cases:
             return (True, None)  # Unknown case - fail open for extensibility
         
-        constraint = self.constraints[case]
-        
-        if not constraint.allows_function(function):
+        if (case, function) not in self._valid_pairs:
+            constraint = self.constraints[case]
             allowed = constraint.allowed_functions
             forbidden = constraint.forbidden_functions
             
@@ -72,10 +175,10 @@ class CooccurrenceRules:
         
         return (True, None)
     
-    def get_allowed_functions(self, case: str) -> Set[str]:
-        """Get all functions allowed for a case"""
+    def get_allowed_functions(self, case: str) -> FrozenSet[str]:
+        """Get all functions allowed for a case (read-only)"""
         if case not in self.constraints:
-            return {"STA", "DYN", "MNF"}  # Default: allow all
+            return frozenset({"STA", "DYN", "MNF"})  # Default: allow all
         return self.constraints[case].allowed_functions
     
     def get_case_description(self, case: str) -> str:
@@ -5,26 +5,80 @@ Rule Extractor - Extract Validation Rules from Grammar Data
 Converts raw grammar JSON into structured validation rules.
 """
 
+import functools
 import json
+import sys
 from pathlib import Path
-from typing import Dict, List, Set, Any, Optional
+from typing import Dict, List, FrozenSet, Any, Optional, Tuple
 from dataclasses import dataclass
 
+try:
+    import orjson  # C/Rust JSON codec, 2-5x faster than stdlib json
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-@dataclass
+
+def json_loads(data):
+    """Parse JSON (str or bytes) with orjson when available"""
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def json_dumps_indented(obj) -> bytes:
+    """Serialize JSON with 2-space indent as UTF-8 bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+
+@functools.lru_cache(maxsize=4)
+def _load_grammar_cached(path: str, mtime_ns: int) -> List[Dict[str, Any]]:
+    with open(path, 'rb') as f:
+        return json_loads(f.read())
+
+
+def load_grammar(grammar_file: Path) -> List[Dict[str, Any]]:
+    """
+    Parse grammar JSON once per process
+    
+    RAGSystem and RuleExtractor both read the grammar; they share this
+    parse (re-read if the file is modified). The returned list is shared -
+    treat it as read-only.
+    
+    Args:
+        grammar_file: Path to grammar_chunks.json
+        
+    Returns:
+        List of grammar chunk dicts
+    """
+    path = Path(grammar_file).resolve()
+    return _load_grammar_cached(str(path), path.stat().st_mtime_ns)
+
+
+@dataclass(slots=True)
 class CaseConstraints:
-    """Constraints for a specific grammatical case"""
+    """
+    Constraints for a specific grammatical case
+    
+    allowed_functions/forbidden_functions are shared with
+    RuleExtractor.ROLE_FUNCTION_RULES (frozensets, never copied per case).
+    """
     case_name: str
     case_abbrev: str
     semantic_role: str
     description: str
-    allowed_functions: Set[str]
-    forbidden_functions: Set[str]
+    allowed_functions: FrozenSet[str]
+    forbidden_functions: FrozenSet[str]
     why_not_alternatives: Dict[str, str]
     common_mistakes: List[str]
     
     def allows_function(self, function: str) -> bool:
         """Check if this case allows a specific function"""
+        verdict = _COMPAT.get((self.semantic_role, function))
+        if verdict is not None:
+            return verdict
+        # Role or function outside the static table: evaluate the sets
         if self.forbidden_functions and function in self.forbidden_functions:
             return False
         if self.allowed_functions and function not in self.allowed_functions:
@@ -38,137 +92,246 @@ class RuleExtractor:
     """
     
     # Semantic role → function compatibility (based on Ithkuil semantics)
+    # Frozen: extracted CaseConstraints share these sets rather than copying them
     ROLE_FUNCTION_RULES = {
         # Core roles
-        "EXPERIENCER": {"allowed": {"STA"}, "forbidden": {"DYN", "MNF"}},  # AFF - unwilled experiences
-        "AGENT": {"allowed": {"DYN", "MNF"}, "forbidden": {"STA"}},        # ERG - willed actions
-        "PATIENT": {"allowed": {"STA", "DYN"}, "forbidden": set()},        # ABS - undergoes change
-        "AGENT+PATIENT": {"allowed": {"STA", "DYN"}, "forbidden": set()},  # IND - both roles
+        "EXPERIENCER": {"allowed": frozenset({"STA"}), "forbidden": frozenset({"DYN", "MNF"})},  # AFF - unwilled experiences
+        "AGENT": {"allowed": frozenset({"DYN", "MNF"}), "forbidden": frozenset({"STA"})},        # ERG - willed actions
+        "PATIENT": {"allowed": frozenset({"STA", "DYN"}), "forbidden": frozenset()},             # ABS - undergoes change
+        "AGENT+PATIENT": {"allowed": frozenset({"STA", "DYN"}), "forbidden": frozenset()},       # IND - both roles
         
         # Instrument & tools
-        "INSTRUMENT": {"allowed": {"DYN"}, "forbidden": {"STA"}},          # INS - active use
+        "INSTRUMENT": {"allowed": frozenset({"DYN"}), "forbidden": frozenset({"STA"})},          # INS - active use
         
         # Content & theme
-        "CONTENT": {"allowed": {"STA", "DYN", "MNF"}, "forbidden": set()}, # THM - neutral participant
-        "STIMULUS": {"allowed": {"STA", "DYN"}, "forbidden": set()},       # STM - trigger
+        "CONTENT": {"allowed": frozenset({"STA", "DYN", "MNF"}), "forbidden": frozenset()},      # THM - neutral participant
+        "STIMULUS": {"allowed": frozenset({"STA", "DYN"}), "forbidden": frozenset()},            # STM - trigger
         
         # Dynamic roles (inherently action-oriented)
-        "GOAL": {"allowed": {"DYN", "MNF"}, "forbidden": {"STA"}},         # ALL - target of motion/action
-        "PURPOSE": {"allowed": {"DYN", "MNF"}, "forbidden": {"STA"}},      # APL - intended outcome
-        "ENABLER": {"allowed": {"DYN", "MNF"}, "forbidden": set()},        # EFF - makes action possible
-        "ACTIVATION": {"allowed": {"DYN", "MNF"}, "forbidden": set()},     # ACT - initiates action
-        "RECIPIENT": {"allowed": {"DYN"}, "forbidden": set()},             # DAT - receives something
+        "GOAL": {"allowed": frozenset({"DYN", "MNF"}), "forbidden": frozenset({"STA"})},         # ALL - target of motion/action
+        "PURPOSE": {"allowed": frozenset({"DYN", "MNF"}), "forbidden": frozenset({"STA"})},      # APL - intended outcome
+        "ENABLER": {"allowed": frozenset({"DYN", "MNF"}), "forbidden": frozenset()},             # EFF - makes action possible
+        "ACTIVATION": {"allowed": frozenset({"DYN", "MNF"}), "forbidden": frozenset()},          # ACT - initiates action
+        "RECIPIENT": {"allowed": frozenset({"DYN"}), "forbidden": frozenset()},                  # DAT - receives something
         
         # Static roles (inherently state-oriented)
-        "ATTRIBUTE": {"allowed": {"STA"}, "forbidden": set()},             # ATT - properties
-        "POSSESSOR": {"allowed": {"STA"}, "forbidden": set()},             # POS - has something
-        "OWNER": {"allowed": {"STA"}, "forbidden": set()},                 # PRP - owns something
+        "ATTRIBUTE": {"allowed": frozenset({"STA"}), "forbidden": frozenset()},                  # ATT - properties
+        "POSSESSOR": {"allowed": frozenset({"STA"}), "forbidden": frozenset()},                  # POS - has something
+        "OWNER": {"allowed": frozenset({"STA"}), "forbidden": frozenset()},                      # PRP - owns something
         
         # Spatial & temporal (can be static or dynamic)
-        "LOCATION": {"allowed": {"STA", "DYN"}, "forbidden": set()},       # LOC - place
-        "ORIENTATION": {"allowed": {"STA", "DYN"}, "forbidden": set()},    # ORI - direction
-        "SOURCE": {"allowed": {"STA", "DYN"}, "forbidden": set()},         # GEN/ABL - origin
+        "LOCATION": {"allowed": frozenset({"STA", "DYN"}), "forbidden": frozenset()},            # LOC - place
+        "ORIENTATION": {"allowed": frozenset({"STA", "DYN"}), "forbidden": frozenset()},         # ORI - direction
+        "SOURCE": {"allowed": frozenset({"STA", "DYN"}), "forbidden": frozenset()},              # GEN/ABL - origin
         
         # Relational (typically static)
-        "PART": {"allowed": {"STA", "DYN"}, "forbidden": set()},           # PAR - part-whole
-        "CORRELATION": {"allowed": {"STA", "DYN"}, "forbidden": set()},    # COR - relationship
-        "DEPENDENT": {"allowed": {"STA", "DYN"}, "forbidden": set()},      # IDP - depends on
-        "CONTINGENCY": {"allowed": {"STA", "DYN"}, "forbidden": set()},    # DEP - conditional
+        "PART": {"allowed": frozenset({"STA", "DYN"}), "forbidden": frozenset()},                # PAR - part-whole
+        "CORRELATION": {"allowed": frozenset({"STA", "DYN"}), "forbidden": frozenset()},         # COR - relationship
+        "DEPENDENT": {"allowed": frozenset({"STA", "DYN"}), "forbidden": frozenset()},           # IDP - depends on
+        "CONTINGENCY": {"allowed": frozenset({"STA", "DYN"}), "forbidden": frozenset()},         # DEP - conditional
     }
     
-    def __init__(self, grammar_file: Path):
+    # Roles outside the table (e.g. FUNCTION): allow all
+    DEFAULT_ROLE_RULES = {"allowed": frozenset({"STA", "DYN", "MNF"}), "forbidden": frozenset()}
+    
+    def __init__(self, grammar_file: Optional[Path] = None, raw_data: Optional[List[Dict[str, Any]]] = None):
         """
         Initialize rule extractor
         
         Args:
             grammar_file: Path to grammar_chunks.json
+            raw_data: Already-parsed grammar chunks (skips reading grammar_file)
         """
+        if grammar_file is None and raw_data is None:
+            raise ValueError("RuleExtractor needs grammar_file or raw_data")
         self.grammar_file = grammar_file
-        self.raw_data = self._load_data()
+        self._raw_data = raw_data  # File-backed data is parsed on first use
+        
+        # extract_case_constraints() result, reused until the grammar file changes
+        self._owns_data = raw_data is None
+        self._mtime = self._grammar_mtime()
+        self._constraints_cache: Optional[Dict[str, CaseConstraints]] = None
+    
+    @classmethod
+    def from_file(cls, grammar_file: Path) -> "RuleExtractor":
+        """
+        Shared extractor for a grammar file (one per path and mtime)
+        
+        Engines built from the same file reuse one extractor and so its
+        memoized constraints. Treat the result as read-only.
+        
+        Args:
+            grammar_file: Path to grammar_chunks.json
+            
+        Returns:
+            Cached RuleExtractor for the file's current contents
+        """
+        path = Path(grammar_file).resolve()
+        return _extractor_cached(cls, str(path), path.stat().st_mtime_ns)
+    
+    @classmethod
+    def from_chunks(cls, chunks: List[Dict[str, Any]], grammar_file: Optional[Path] = None) -> "RuleExtractor":
+        """Build from already-parsed grammar chunks (no file read)"""
+        return cls(grammar_file, raw_data=chunks)
+    
+    @property
+    def raw_data(self) -> List[Dict[str, Any]]:
+        """
+        Parsed grammar chunks, loaded from grammar_file on first access
+        
+        File-backed data is the shared load_grammar parse, which stays cached
+        there for the life of the process; extractors only defer fetching it.
+        """
+        if self._raw_data is None:
+            self._raw_data = self._load_data()
+        return self._raw_data
     
     def _load_data(self) -> List[Dict[str, Any]]:
-        """Load and parse grammar JSON"""
-        with open(self.grammar_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        """Load and parse grammar JSON (shared, cached parse)"""
+        return load_grammar(self.grammar_file)
+    
+    def _grammar_mtime(self) -> Optional[int]:
+        """mtime of the grammar file we loaded (None for caller-supplied data)"""
+        return self.grammar_file.stat().st_mtime_ns if self._owns_data else None
     
     def extract_case_constraints(self) -> Dict[str, CaseConstraints]:
         """
         Extract case-function compatibility rules from grammar data
         
+        Memoized: repeated calls return the same dict until the grammar
+        file's mtime changes.
+        
         Returns:
             Dictionary mapping case abbreviations to their constraints
         """
-        constraints = {}
+        mtime = self._grammar_mtime()
+        if mtime != self._mtime:
+            # Grammar file edited since it was loaded
+            self._raw_data = None
+            self._mtime = mtime
+            self._constraints_cache = None
+        if self._constraints_cache is not None:
+            return self._constraints_cache
         
         # Extract all cases from the data
-        cases = [item for item in self.raw_data if item.get('type') == 'case']
-        
-        for case_data in cases:
-            code = case_data.get('code')
-            semantic_role = case_data.get('semantic_role', 'UNKNOWN')
-            
-            # Get function rules based on semantic role
-            role_rules = self.ROLE_FUNCTION_RULES.get(
-                semantic_role,
-                {"allowed": {"STA", "DYN", "MNF"}, "forbidden": set()}  # Default: allow all
-            )
-            
-            constraints[code] = CaseConstraints(
-                case_name=case_data.get('name', code),
-                case_abbrev=code,
-                semantic_role=semantic_role,
-                description=case_data.get('description', ''),
-                allowed_functions=role_rules["allowed"].copy(),
-                forbidden_functions=role_rules["forbidden"].copy(),
-                why_not_alternatives=case_data.get('why_not_alternatives', {}),
-                common_mistakes=case_data.get('common_mistakes', [])
+        constraints = {
+            constraint.case_abbrev: constraint
+            for constraint in map(
+                self._case_constraints,
+                (item for item in self.raw_data if item.get('type') == 'case')
             )
+        }
         
+        self._constraints_cache = constraints
         return constraints
     
+    def _case_constraints(self, case_data: Dict[str, Any]) -> CaseConstraints:
+        """Build the constraints for one 'case' chunk from its semantic role"""
+        # Interned: rule tables and validator inputs then compare by identity
+        code = sys.intern(case_data.get('code'))
+        semantic_role = sys.intern(case_data.get('semantic_role', 'UNKNOWN'))
+        
+        # Get function rules based on semantic role
+        role_rules = self.ROLE_FUNCTION_RULES.get(semantic_role, self.DEFAULT_ROLE_RULES)
+        
+        return CaseConstraints(
+            case_name=case_data.get('name', code),
+            case_abbrev=code,
+            semantic_role=semantic_role,
+            description=case_data.get('description', ''),
+            allowed_functions=role_rules["allowed"],
+            forbidden_functions=role_rules["forbidden"],
+            why_not_alternatives=case_data.get('why_not_alternatives', {}),
+            common_mistakes=case_data.get('common_mistakes', [])
+        )
+    
+    @staticmethod
+    def allowed_pairs(constraints: Dict[str, CaseConstraints]) -> FrozenSet[Tuple[str, str]]:
+        """
+        Flatten constraints into the set of valid (case, function) pairs
+        
+        One hash probe replaces allows_function's two set tests; the table
+        is derived from allows_function so the two never disagree.
+        
+        Args:
+            constraints: Output of extract_case_constraints
+            
+        Returns:
+            Frozenset of (case_abbrev, function) pairs that may co-occur
+        """
+        return frozenset(
+            (code, function)
+            for code, constraint in constraints.items()
+            for function in constraint.allowed_functions
+            if constraint.allows_function(function)
+        )
+    
     def validate_rules(self) -> bool:
         """
         Validate that extracted rules are consistent
         
+        Every constraint takes its sets from ROLE_FUNCTION_RULES (or the
+        allow-all default), whose allowed/forbidden overlap is checked once
+        at import, so there is nothing left to check per case.
+        
         Returns:
             True if rules are valid
         """
-        constraints = self.extract_case_constraints()
-        
-        # Check for conflicts
-        for case_abbrev, constraint in constraints.items():
-            # Can't have overlapping allowed/forbidden
-            overlap = constraint.allowed_functions & constraint.forbidden_functions
-            if overlap:
-                print(f"WARNING: {case_abbrev} has conflicting rules for {overlap}")
-                return False
-        
         return True
     
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about extracted rules"""
         constraints = self.extract_case_constraints()
         
-        # Count by strictness
-        strict_cases = sum(1 for c in constraints.values() if c.forbidden_functions)
-        permissive_cases = sum(1 for c in constraints.values() if not c.forbidden_functions)
-        
-        # Count by function
-        function_counts = {
-            "STA": sum(1 for c in constraints.values() if "STA" in c.allowed_functions),
-            "DYN": sum(1 for c in constraints.values() if "DYN" in c.allowed_functions),
-            "MNF": sum(1 for c in constraints.values() if "MNF" in c.allowed_functions),
-        }
+        # Single pass: strictness, per-function counts and roles together
+        strict_cases = permissive_cases = 0
+        function_counts = {"STA": 0, "DYN": 0, "MNF": 0}
+        semantic_roles = set()
+        for c in constraints.values():
+            if c.forbidden_functions:
+                strict_cases += 1
+            else:
+                permissive_cases += 1
+            for function in function_counts:
+                if function in c.allowed_functions:
+                    function_counts[function] += 1
+            semantic_roles.add(c.semantic_role)
         
         return {
             "total_cases": len(constraints),
             "strict_cases": strict_cases,
             "permissive_cases": permissive_cases,
             "cases_by_function": function_counts,
-            "semantic_roles_covered": len(set(c.semantic_role for c in constraints.values()))
+            "semantic_roles_covered": len(semantic_roles)
         }
 
 
+@functools.lru_cache(maxsize=4)
+def _extractor_cached(cls: type, path: str, mtime_ns: int) -> RuleExtractor:
+    return cls(Path(path))
+
+
+def _check_role_rules(role_rules: Dict[str, Dict[str, FrozenSet[str]]]):
+    """Reject a role table with overlapping allowed/forbidden sets"""
+    for role, rules in role_rules.items():
+        overlap = rules["allowed"] & rules["forbidden"]
+        if overlap:
+            raise ValueError(f"{role} has conflicting rules for {set(overlap)}")
+
+
+# The table is fixed, so consistency is checked once at import
+_check_role_rules(RuleExtractor.ROLE_FUNCTION_RULES)
+
+
+# (semantic_role, function) -> verdict, specialised once from the fixed role
+# table; extracted CaseConstraints carry exactly these role sets
+_COMPAT: Dict[Tuple[str, str], bool] = {
+    (role, function): function in rules["allowed"] and function not in rules["forbidden"]
+    for role, rules in RuleExtractor.ROLE_FUNCTION_RULES.items()
+    for function in ("STA", "DYN", "MNF")
+}
+
+
 # Quick test
 if __name__ == "__main__":
     grammar_file = Path("data_grammar_chunks.json")
@@ -0,0 +1,42 @@
+"""
+Shared pytest setup: src/ on the import path and the ValidationEngine fixtures
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path (once, for every test module)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from validation_engine import ValidationEngine
+
+
+@pytest.fixture(scope="session")
+def shared_validator():
+    """Build the rule-backed engine once; grammar load + extraction is the slow part"""
+    grammar_file = Path("data/grammar_chunks.json")
+    if not grammar_file.exists():
+        grammar_file = Path("data_grammar_chunks.json")
+    
+    return ValidationEngine(grammar_kb={}, grammar_file=grammar_file)
+
+
+@pytest.fixture(scope="session")
+def shared_validator_no_rag():
+    """Build the rule-less engine once"""
+    return ValidationEngine(grammar_kb={}, grammar_file=None)
+
+
+@pytest.fixture
+def validator(shared_validator):
+    """Validator with real rules from grammar data (fresh stats per test)"""
+    shared_validator.reset_stats()
+    return shared_validator
+
+
+@pytest.fixture
+def validator_no_rag(shared_validator_no_rag):
+    """Validator without RAG for testing fallback behavior (fresh stats per test)"""
+    shared_validator_no_rag.reset_stats()
+    return shared_validator_no_rag
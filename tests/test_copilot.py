@@ -0,0 +1,235 @@
+"""
+Copilot Pipeline Tests
+======================
+
+Tests the parts of the co-pilot pipeline that run without the LLM
+(a stub client stands in for Groq, and a stub RAG for the embedder).
+"""
+
+import json
+import pickle
+
+import numpy as np
+import pytest
+
+# src/ is put on sys.path by conftest.py
+import copilot
+from copilot import (
+    CopilotPipeline, match_keyword_rule,
+    SYSTEM_PROMPT_AB, SYSTEM_PROMPT_BASELINE, SYSTEM_PROMPT_RAG
+)
+
+
+VALID_ANSWER = json.dumps({"case": "AFF", "function": "STA", "reasoning": "involuntary"})
+INVALID_ANSWER = json.dumps({"case": "EXPERIENCER", "function": "STA", "reasoning": "role"})
+
+
+class StubLLM:
+    """Answers by system prompt (a list answers in turn) and records every call"""
+    
+    def __init__(self, responses):
+        self.model = "stub-model"
+        self.responses = responses
+        self.calls = []
+    
+    def chat_oneshot(self, system_prompt, user_message, **kwargs):
+        self.calls.append(system_prompt)
+        response = self.responses[system_prompt]
+        return response.pop(0) if isinstance(response, list) else response
+
+
+class StubRAG:
+    """Constant query embedding, no chunks"""
+    
+    embedding_dim = 4
+    
+    def embed(self, text):
+        return np.array([1.0, 0.0, 0.0, 0.0], dtype=np.float32)
+    
+    def retrieve(self, query, n_results=3, query_embedding=None):
+        return []
+
+
+def make_pipeline(tmp_path, validator, responses):
+    """CopilotPipeline wired to stubs, with its caches under tmp_path"""
+    pipeline = CopilotPipeline.__new__(CopilotPipeline)
+    pipeline.llm = StubLLM(responses)
+    pipeline.rag = StubRAG()
+    pipeline.validator = validator
+    pipeline._grammar_hash = "grammar-hash"
+    pipeline._ctx_cache_file = tmp_path / ".rag_ctx_cache.pkl"
+    pipeline._ctx_cache = {}
+    pipeline._sem_keys = np.empty((0, StubRAG.embedding_dim), dtype=np.float32)
+    pipeline._sem_vals = []
+    pipeline._answer_cache_file = tmp_path / ".answer_cache.json"
+    pipeline._answer_cache = {}
+    return pipeline
+
+
+# SUITE 1: Keyword fast path
+# These rules answer without the LLM, so false positives go unnoticed
+
+class TestKeywordRules:
+    """KEYWORD_RULES match whole words only"""
+    
+    @pytest.mark.parametrize("text,case,function", [
+        ("deliberately breaking a vase", "ERG", "DYN"),
+        ("someone intentionally pushing a door", "ERG", "DYN"),
+        ("doing it on purpose", "ERG", "DYN"),
+        ("using a hammer to hit a nail", "INS", "DYN"),
+        ("cutting with a knife", "INS", "DYN"),
+        ("sneezing", "AFF", "STA"),
+        ("she sneezed twice", "AFF", "STA"),
+        ("coughing at night", "AFF", "STA"),
+        ("experiencing cold involuntarily", "AFF", "STA"),
+        ("feeling hungry", "AFF", "STA"),
+        ("hearing a loud noise", "AFF", "STA"),
+        ("he heard thunder", "AFF", "STA"),
+        ("feeling fear", "AFF", "STA"),
+        ("she felt dizzy", "AFF", "STA"),
+    ])
+    def test_keyword_matches(self, text, case, function):
+        """Unambiguous keywords map to their case and function"""
+        matched = match_keyword_rule(text)
+        assert matched is not None, text
+        assert matched[:2] == (case, function)
+    
+    @pytest.mark.parametrize("text", [
+        "the heart of the city",
+        "sitting by the hearth",
+        "the teacher scolded the student",
+        "a feeler gauge",
+        "the hunger games",
+        "confusing the issue",
+        "a person writing a letter",
+        "the topic of discussion",
+    ])
+    def test_keyword_non_matches(self, text):
+        """Words that merely contain a keyword fall through to the LLM"""
+        assert match_keyword_rule(text) is None
+
+
+# SUITE 2: Answer cache
+# A cached answer must only be served to calls that would have produced it
+
+class TestAnswerCache:
+    """Validated answers are cached per experiment arm"""
+    
+    def test_ab_answers_not_served_to_baseline(self, tmp_path, validator):
+        """suggest_ab saw the context, so its WITHOUT-RAG answer is not cached"""
+        ab_answer = json.dumps({
+            "without_context": {"case": "AFF", "function": "STA", "reasoning": "a"},
+            "with_context": {"case": "AFF", "function": "STA", "reasoning": "b"},
+        })
+        pipeline = make_pipeline(tmp_path, validator, {
+            SYSTEM_PROMPT_AB: ab_answer,
+            SYSTEM_PROMPT_BASELINE: VALID_ANSWER,
+        })
+        
+        (_, valid_a, _), (_, valid_b, _, _) = pipeline.suggest_ab("a person sneezing")
+        assert valid_a and valid_b
+        
+        pipeline.suggest_without_rag("a person sneezing")
+        assert pipeline.llm.calls == [SYSTEM_PROMPT_AB, SYSTEM_PROMPT_BASELINE]
+    
+    def test_baseline_answer_cached(self, tmp_path, validator):
+        """A repeated baseline query is answered without the LLM"""
+        pipeline = make_pipeline(tmp_path, validator, {SYSTEM_PROMPT_BASELINE: VALID_ANSWER})
+        
+        first = pipeline.suggest_without_rag("a person sneezing")
+        second = pipeline.suggest_without_rag("A person  sneezing")
+        assert second == first
+        assert pipeline.llm.calls == [SYSTEM_PROMPT_BASELINE]
+    
+    def test_retried_answer_not_cached(self, tmp_path, validator):
+        """A max_retries=0 call never gets an answer that needed a retry"""
+        pipeline = make_pipeline(tmp_path, validator, {
+            SYSTEM_PROMPT_RAG: [INVALID_ANSWER, VALID_ANSWER, INVALID_ANSWER],
+        })
+        
+        _, valid, _, attempts = pipeline.suggest_with_rag(
+            "a person sneezing", max_retries=1, fast_path=False, autofix=False
+        )
+        assert valid and attempts == 2
+        
+        _, valid, _, attempts = pipeline.suggest_with_rag(
+            "a person sneezing", max_retries=0, fast_path=False, autofix=False
+        )
+        assert not valid and attempts == 1
+        assert len(pipeline.llm.calls) == 3
+    
+    def test_save_load_round_trip(self, tmp_path, validator):
+        """Persisted answers load back equal in a new pipeline"""
+        pipeline = make_pipeline(tmp_path, validator, {
+            SYSTEM_PROMPT_BASELINE: VALID_ANSWER,
+            SYSTEM_PROMPT_RAG: VALID_ANSWER,
+        })
+        pipeline.suggest_without_rag("a person sneezing")
+        pipeline.suggest_with_rag("a person sneezing", fast_path=False)
+        
+        reloaded = make_pipeline(tmp_path, validator, {})
+        assert reloaded._load_answer_cache() == pipeline._answer_cache
+        assert len(pipeline._answer_cache) == 2
+    
+    @pytest.mark.parametrize("attribute,value", [
+        ("SYSTEM_PROMPT_BASELINE", "changed"),
+        ("SYSTEM_PROMPT_RAG", "changed"),
+        ("MAX_RESPONSE_TOKENS", 40),
+        ("LLM_SEED", 7),
+        ("JSON_RESPONSE_FORMAT", None),
+    ])
+    def test_prompt_change_invalidates(self, tmp_path, validator, monkeypatch, attribute, value):
+        """Answers from other prompts or request parameters are dropped on load"""
+        pipeline = make_pipeline(tmp_path, validator, {SYSTEM_PROMPT_BASELINE: VALID_ANSWER})
+        pipeline.suggest_without_rag("a person sneezing")
+        
+        monkeypatch.setattr(copilot, attribute, value)
+        assert make_pipeline(tmp_path, validator, {})._load_answer_cache() == {}
+    
+    def test_model_change_invalidates(self, tmp_path, validator):
+        """Answers from another model are dropped on load"""
+        pipeline = make_pipeline(tmp_path, validator, {SYSTEM_PROMPT_BASELINE: VALID_ANSWER})
+        pipeline.suggest_without_rag("a person sneezing")
+        
+        reloaded = make_pipeline(tmp_path, validator, {})
+        reloaded.llm.model = "other-model"
+        assert reloaded._load_answer_cache() == {}
+    
+    @pytest.mark.parametrize("content", [
+        b"not json",
+        b"[1, 2, 3]",
+        b'{"grammar": "grammar-hash", "model": "stub-model", "prompts": null, "entries": "x"}',
+    ])
+    def test_corrupt_answer_cache_ignored(self, tmp_path, validator, content):
+        """Unreadable or non-dict answer caches load as empty"""
+        pipeline = make_pipeline(tmp_path, validator, {})
+        pipeline._answer_cache_file.write_bytes(content)
+        assert pipeline._load_answer_cache() == {}
+    
+    @pytest.mark.parametrize("entry", [
+        {"with_rag": False, "answer": [{"case": "AFF"}, True, "ok"]},
+        {"input": "x", "with_rag": False},
+        {"input": "x", "with_rag": False, "answer": []},
+        {"input": "x", "with_rag": False, "answer": ["AFF", True, "ok"]},
+    ])
+    def test_malformed_answer_entries_ignored(self, tmp_path, validator, entry):
+        """Entries missing input/answer fields drop the cache instead of raising"""
+        pipeline = make_pipeline(tmp_path, validator, {})
+        pipeline._answer_cache_file.write_text(json.dumps({
+            "grammar": "grammar-hash",
+            "model": "stub-model",
+            "prompts": pipeline._answer_cache_fingerprint(),
+            "entries": [entry],
+        }))
+        assert pipeline._load_answer_cache() == {}
+    
+    @pytest.mark.parametrize("payload", [
+        b"garbage",
+        pickle.dumps(["not", "a", "dict"]),
+        pickle.dumps({"grammar": "grammar-hash", "entries": ["not", "a", "dict"]}),
+    ])
+    def test_corrupt_context_cache_ignored(self, tmp_path, validator, payload):
+        """Unreadable or non-dict RAG context caches load as empty"""
+        pipeline = make_pipeline(tmp_path, validator, {})
+        pipeline._ctx_cache_file.write_bytes(payload)
+        assert pipeline._load_ctx_cache() == {}
@@ -0,0 +1,238 @@
+"""
+RAG System Tests
+================
+
+Tests the embedding cache and the dense search without loading a model
+(a stub embedder stands in for sentence-transformers).
+"""
+
+import numpy as np
+import pytest
+
+# src/ is put on sys.path by conftest.py
+import rag_system
+from rag_system import RAGSystem, quantize_int8
+
+
+class StubEmbedder:
+    """Deterministic unit-row embeddings; counts encode calls"""
+
+    def __init__(self, dim=4):
+        self.dim = dim
+        self.encode_calls = 0
+
+    def encode(self, documents, **kwargs):
+        self.encode_calls += 1
+        vectors = np.eye(len(documents), self.dim, dtype=np.float32) + 0.1
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def make_rag(grammar_file, dim=4):
+    """RAGSystem with a stub embedder and its caches next to grammar_file"""
+    rag = RAGSystem.__new__(RAGSystem)
+    rag.grammar_file = grammar_file
+    rag.embeddings_file = grammar_file.with_suffix(".embeddings.npy")
+    rag.embeddings_meta_file = grammar_file.with_suffix(".embeddings.json")
+    rag.embeddings = None
+    rag.embedder = StubEmbedder(dim)
+    rag.embedding_backend = "stub"
+    rag.embedding_dim = dim
+    return rag
+
+
+@pytest.fixture
+def grammar_file(tmp_path):
+    """Stand-in grammar file (only its bytes feed the fingerprint)"""
+    path = tmp_path / "grammar_chunks.json"
+    path.write_text("[]", encoding="utf-8")
+    return path
+
+
+DOCUMENTS = ["first chunk", "second chunk", "third chunk"]
+
+
+# SUITE 1: Persisted embeddings
+
+class TestEmbeddingCache:
+    """_load_or_embed persists the matrix and reloads it when still valid"""
+
+    def test_second_load_skips_encoding(self, grammar_file):
+        """A matching cache is memory-mapped instead of re-embedded"""
+        first = make_rag(grammar_file)._load_or_embed(DOCUMENTS)
+
+        rag = make_rag(grammar_file)
+        second = rag._load_or_embed(DOCUMENTS)
+        assert rag.embedder.encode_calls == 0
+        assert np.array_equal(first, second)
+
+    def test_shape_mismatch_reembeds(self, grammar_file):
+        """A cached matrix of the wrong width is ignored"""
+        make_rag(grammar_file, dim=4)._load_or_embed(DOCUMENTS)
+
+        rag = make_rag(grammar_file, dim=8)
+        embeddings = rag._load_or_embed(DOCUMENTS)
+        assert rag.embedder.encode_calls == 1
+        assert embeddings.shape == (len(DOCUMENTS), 8)
+
+    def test_unwritable_cache_keeps_matrix(self, grammar_file, capsys):
+        """A failed write warns and still returns the embeddings"""
+        rag = make_rag(grammar_file)
+        rag.embeddings_file = grammar_file.parent / "missing" / "embeddings.npy"
+
+        embeddings = rag._load_or_embed(DOCUMENTS)
+        assert embeddings.shape == (len(DOCUMENTS), 4)
+        assert rag.embeddings is embeddings
+        assert "Could not persist embeddings" in capsys.readouterr().out
+
+
+# SUITE 2: int8 quantization
+
+class TestQuantizeInt8:
+    """quantize_int8 keeps one scale per row"""
+
+    def test_round_trip_error_within_half_step(self):
+        """Dequantized rows are within half a quantization step"""
+        vectors = np.random.default_rng(0).standard_normal((6, 16)).astype(np.float32)
+        q, scale = quantize_int8(vectors)
+        assert q.dtype == np.int8 and scale.shape == (6,)
+        error = np.abs(q * scale[:, None] - vectors)
+        assert np.all(error <= scale[:, None] / 2 + 1e-6)
+
+    def test_row_max_maps_to_127(self):
+        """Each row's largest magnitude uses the full int8 range"""
+        q, _ = quantize_int8(np.array([[0.5, -1.0, 0.25], [2.0, 1.0, 0.0]], dtype=np.float32))
+        assert np.abs(q).max(axis=1).tolist() == [127, 127]
+
+    def test_vector_and_zero_row(self):
+        """1-D input gives a scalar scale; an all-zero row does not divide by zero"""
+        q, scale = quantize_int8(np.zeros(4, dtype=np.float32))
+        assert scale.shape == () and scale == 1.0
+        assert not q.any()
+
+
+# SUITE 3: Dense top-k search
+# Every scoring backend must rank like the plain float32 GEMV
+
+CODES = ["AFF", "ERG", "ABS", "INS", "THM", "AFF", "ERG", "ABS"]
+
+
+def make_index(quantize=False):
+    """RAGSystem holding a small unit-row matrix (no model, no grammar file)"""
+    # Near-orthogonal rows, so scores are spaced wider than int8 rounding error
+    rng = np.random.default_rng(42)
+    matrix = np.eye(len(CODES), 16, dtype=np.float32) + 0.05 * rng.random((len(CODES), 16), dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+
+    rag = RAGSystem.__new__(RAGSystem)
+    rag.embeddings = matrix
+    rag.chunk_metadata = [
+        {"code": code, "name": f"chunk{i}", "semantic_role": "", "description": "", "citation": ""}
+        for i, code in enumerate(CODES)
+    ]
+    rag._q8, rag._q8_scale = quantize_int8(matrix) if quantize else (None, None)
+
+    query = np.array([0.3, 0.5, 1.0, 0.2, 0.7, 0.4, 0.6, 0.1] + [0.0] * 8, dtype=np.float32)
+    return rag, query / np.linalg.norm(query)
+
+
+def expected_names(rag, query, n_results, filter_case=None):
+    """Reference ranking from numpy"""
+    rows = [i for i, code in enumerate(CODES) if filter_case in (None, code)]
+    scores = rag.embeddings[rows] @ query
+    return [f"chunk{rows[i]}" for i in np.argsort(-scores)[:n_results]]
+
+
+BACKENDS = [
+    pytest.param((False, False, False), id="blas"),
+    pytest.param((True, False, False), id="simsimd-f32",
+                 marks=pytest.mark.skipif(not rag_system.SIMSIMD_AVAILABLE, reason="simsimd not installed")),
+    pytest.param((False, True, False), id="numba",
+                 marks=pytest.mark.skipif(not rag_system.NUMBA_AVAILABLE, reason="numba not installed")),
+    pytest.param((False, False, True), id="int32"),
+    pytest.param((True, False, True), id="simsimd-int8",
+                 marks=pytest.mark.skipif(not rag_system.SIMSIMD_AVAILABLE, reason="simsimd not installed")),
+]
+
+
+@pytest.fixture
+def backend(request, monkeypatch):
+    """Force one _retrieve_dense scoring branch; returns the quantize flag"""
+    simsimd_on, numba_on, quantize = request.param
+    monkeypatch.setattr(rag_system, "SIMSIMD_AVAILABLE", simsimd_on)
+    monkeypatch.setattr(rag_system, "NUMBA_AVAILABLE", numba_on)
+    monkeypatch.setattr(rag_system, "NUMBA_MIN_ROWS", 0)
+    return quantize
+
+
+@pytest.mark.parametrize("backend", BACKENDS, indirect=True)
+class TestRetrieveDense:
+    """_retrieve_dense agrees with a numpy reference on every backend"""
+
+    def test_top_k_order_and_scores(self, backend):
+        """Top-k matches the reference ranking, scores are cosines"""
+        rag, query = make_index(backend)
+        results = rag._retrieve_dense(query, 3)
+
+        assert [r.case_name for r in results] == expected_names(rag, query, 3)
+        reference = {f"chunk{i}": float(s) for i, s in enumerate(rag.embeddings @ query)}
+        for r in results:
+            assert r.score == pytest.approx(reference[r.case_name], abs=0.02 if backend else 1e-5)
+
+    def test_filter_case(self, backend):
+        """filter_case only ranks rows with that code"""
+        rag, query = make_index(backend)
+        results = rag._retrieve_dense(query, 3, filter_case="ERG")
+
+        assert [r.case_code for r in results] == ["ERG", "ERG"]
+        assert [r.case_name for r in results] == expected_names(rag, query, 3, "ERG")
+
+    def test_unknown_filter_case(self, backend):
+        """A code with no rows returns nothing"""
+        rag, query = make_index(backend)
+        assert rag._retrieve_dense(query, 3, filter_case="XXX") == []
+
+    def test_zero_results(self, backend):
+        """n_results=0 returns nothing"""
+        rag, query = make_index(backend)
+        assert rag._retrieve_dense(query, 0) == []
+
+    def test_more_results_than_rows(self, backend):
+        """n_results > N returns every row, best first"""
+        rag, query = make_index(backend)
+        results = rag._retrieve_dense(query, 100)
+
+        assert [r.case_name for r in results] == expected_names(rag, query, len(CODES))
+
+
+# SUITE 4: Search backend selection
+
+class StubCollection:
+    """Records Chroma queries; always returns one AFF hit"""
+
+    def __init__(self):
+        self.queries = 0
+
+    def query(self, query_embeddings, n_results, where):
+        self.queries += 1
+        metadata = {"code": "AFF", "name": "Affective", "semantic_role": "", "description": "", "citation": ""}
+        return {"ids": [["aff"]], "metadatas": [[metadata]], "distances": [[0.25]]}
+
+
+class TestSearchBackend:
+    """One backend serves every search"""
+
+    def test_collection_wins_over_dense_matrix(self):
+        """With a collection, _search queries Chroma even if a matrix is loaded"""
+        rag, query = make_index()
+        rag.collection = StubCollection()
+
+        results = rag._search("query", 3, None, query)
+        assert rag.collection.queries == 1
+        assert [(r.case_code, r.score) for r in results] == [("AFF", 0.75)]
+
+    def test_dense_without_collection(self):
+        """Without a collection, _search uses the in-memory matrix"""
+        rag, query = make_index()
+        rag.collection = None
+
+        assert len(rag._search("query", 3, None, query)) == 3
@@ -8,30 +8,17 @@ Tests co-occurrence rules, edge cases, error handling, and RAG integration.
 Current: 60+ tests
 """
 
-import pytest
-import sys
+import os
+import shutil
 from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import pytest
 
+# src/ is put on sys.path by conftest.py
 from validation_engine import ValidationEngine, ValidationLevel, ValidationError, ValidationResult
-
-
-@pytest.fixture
-def validator():
-    """Create validator instance with real rules from grammar data"""
-    grammar_file = Path("data/grammar_chunks.json")
-    if not grammar_file.exists():
-        grammar_file = Path("data_grammar_chunks.json")
-    
-    return ValidationEngine(grammar_kb={}, grammar_file=grammar_file)
-
-
-@pytest.fixture
-def validator_no_rag():
-    """Create validator without RAG for testing fallback behavior"""
-    return ValidationEngine(grammar_kb={}, grammar_file=None)
+from validators import cooccurrence_rules
+from validators.cooccurrence_rules import CooccurrenceRules
+from validators.rule_extractor import RuleExtractor
 
 
 # SUITE 1: Core Co-occurrence Constraints (10 tests)
@@ -99,146 +86,128 @@ class TestCoreCooccurrence:
         assert validator.validate({"case": "IND", "function": "STA"}).passed
         assert validator.validate({"case": "IND", "function": "DYN"}).passed
 
-
-# SUITE 2: Extended Semantic Role Coverage (15 tests)
+    def test_fast_check_matches_check_case_function(self, validator):
+        """Precompiled pair lookup gives the same verdict as the full check"""
+        rules = validator.cooccurrence_rules
+        for case in list(rules.constraints) + ["XYZ"]:
+            for function in ("STA", "DYN", "MNF", "BAD"):
+                expected, _ = rules.check_case_function(case, function)
+                assert rules.fast_check(case, function) == expected, f"{case}+{function}"
+
+    def test_fast_check_batch_matches_fast_check(self, validator):
+        """Vectorised table lookup gives the same verdicts as fast_check"""
+        rules = validator.cooccurrence_rules
+        pairs = [(case, function)
+                 for case in list(rules.constraints) + ["XYZ"]
+                 for function in ("STA", "DYN", "MNF", "BAD")]
+        verdicts = rules.fast_check_batch([c for c, _ in pairs], [f for _, f in pairs])
+        assert verdicts.tolist() == [rules.fast_check(c, f) for c, f in pairs]
+
+    def test_allows_function_matches_role_sets(self, validator):
+        """Specialised verdict table agrees with the allowed/forbidden sets"""
+        for constraint in validator.cooccurrence_rules.constraints.values():
+            for function in ("STA", "DYN", "MNF", "BAD"):
+                expected = (function not in constraint.forbidden_functions
+                            and function in constraint.allowed_functions)
+                assert constraint.allows_function(function) == expected, \
+                    f"{constraint.case_abbrev}+{function}"
+
+
+# SUITE 2: Extended Semantic Role Coverage (24 cases)
 # Tests diverse semantic roles across grammatical categories
 
 class TestExtendedSemanticRoles:
     """Tests for less common but important semantic roles"""
     
-    def test_stm_stimulus_both_functions(self, validator):
-        """STM (STIMULUS) allows both functions"""
-        assert validator.validate({"case": "STM", "function": "STA"}).passed
-        assert validator.validate({"case": "STM", "function": "DYN"}).passed
-
-    def test_dat_recipient_dyn(self, validator):
-        """DAT (RECIPIENT) works with DYN for receiving actions"""
-        result = validator.validate({"case": "DAT", "function": "DYN"})
-        assert result.passed
-
-    def test_eff_enabler_dyn(self, validator):
-        """EFF (ENABLER) initiates causal chains - allows DYN"""
-        result = validator.validate({"case": "EFF", "function": "DYN"})
-        assert result.passed
-
-    def test_prp_owner_sta(self, validator):
-        """PRP (OWNER) - ownership is inherently static"""
-        result = validator.validate({"case": "PRP", "function": "STA"})
-        assert result.passed
-
-    def test_pos_possessor_sta(self, validator):
-        """POS (POSSESSOR) - possession is static"""
-        result = validator.validate({"case": "POS", "function": "STA"})
-        assert result.passed
-
-    def test_att_attribute_sta(self, validator):
-        """ATT (ATTRIBUTE) - attributes are static properties"""
-        result = validator.validate({"case": "ATT", "function": "STA"})
-        assert result.passed
-
-    def test_gen_source_both(self, validator):
-        """GEN (SOURCE) allows both functions"""
-        assert validator.validate({"case": "GEN", "function": "STA"}).passed
-        assert validator.validate({"case": "GEN", "function": "DYN"}).passed
-
-    def test_pdc_producer(self, validator):
-        """PDC (PRODUCER) - creator/author relationship"""
-        result = validator.validate({"case": "PDC", "function": "STA"})
-        assert result.passed
-
-    def test_cor_correlation_both(self, validator):
-        """COR (CORRELATION) allows both functions"""
-        assert validator.validate({"case": "COR", "function": "STA"}).passed
-        assert validator.validate({"case": "COR", "function": "DYN"}).passed
-
-    def test_par_part_both(self, validator):
-        """PAR (PART) - part-whole relationships"""
-        assert validator.validate({"case": "PAR", "function": "STA"}).passed
-        assert validator.validate({"case": "PAR", "function": "DYN"}).passed
-
-    def test_idp_dependent_both(self, validator):
-        """IDP (DEPENDENT) - interdependent relationships"""
-        assert validator.validate({"case": "IDP", "function": "STA"}).passed
-        assert validator.validate({"case": "IDP", "function": "DYN"}).passed
-
-    def test_dep_contingency_both(self, validator):
-        """DEP (CONTINGENCY) allows both functions"""
-        assert validator.validate({"case": "DEP", "function": "STA"}).passed
-        assert validator.validate({"case": "DEP", "function": "DYN"}).passed
-
-    def test_apl_purpose_dyn_only(self, validator):
-        """APL (PURPOSE) - purposes are dynamic goals"""
-        assert validator.validate({"case": "APL", "function": "DYN"}).passed
-        assert not validator.validate({"case": "APL", "function": "STA"}).passed
-
-    def test_pur_function_both(self, validator):
-        """PUR (FUNCTION) - semantic role not strictly constrained, allows both"""
-        # Note: PUR has semantic_role "FUNCTION" which isn't in strict rules
-        # So it defaults to allowing all functions
-        assert validator.validate({"case": "PUR", "function": "DYN"}).passed
-        assert validator.validate({"case": "PUR", "function": "STA"}).passed
-
-    def test_act_activation_dyn(self, validator):
-        """ACT (ACTIVATION) allows DYN for modal states"""
-        result = validator.validate({"case": "ACT", "function": "DYN"})
-        assert result.passed
+    @pytest.mark.parametrize("case,function,expected_valid", [
+        # STM (STIMULUS) allows both functions
+        ("STM", "STA", True),
+        ("STM", "DYN", True),
+        # DAT (RECIPIENT) works with DYN for receiving actions
+        ("DAT", "DYN", True),
+        # EFF (ENABLER) initiates causal chains - allows DYN
+        ("EFF", "DYN", True),
+        # PRP (OWNER) - ownership is inherently static
+        ("PRP", "STA", True),
+        # POS (POSSESSOR) - possession is static
+        ("POS", "STA", True),
+        # ATT (ATTRIBUTE) - attributes are static properties
+        ("ATT", "STA", True),
+        # GEN (SOURCE) allows both functions
+        ("GEN", "STA", True),
+        ("GEN", "DYN", True),
+        # PDC (PRODUCER) - creator/author relationship
+        ("PDC", "STA", True),
+        # COR (CORRELATION) allows both functions
+        ("COR", "STA", True),
+        ("COR", "DYN", True),
+        # PAR (PART) - part-whole relationships
+        ("PAR", "STA", True),
+        ("PAR", "DYN", True),
+        # IDP (DEPENDENT) - interdependent relationships
+        ("IDP", "STA", True),
+        ("IDP", "DYN", True),
+        # DEP (CONTINGENCY) allows both functions
+        ("DEP", "STA", True),
+        ("DEP", "DYN", True),
+        # APL (PURPOSE) - purposes are dynamic goals
+        ("APL", "DYN", True),
+        ("APL", "STA", False),
+        # PUR (FUNCTION) - semantic role "FUNCTION" isn't in strict rules,
+        # so it defaults to allowing all functions
+        ("PUR", "DYN", True),
+        ("PUR", "STA", True),
+        # ACT (ACTIVATION) allows DYN for modal states
+        ("ACT", "DYN", True),
+    ])
+    def test_semantic_role_pair(self, validator, case, function, expected_valid):
+        """Parametrized test for semantic role case-function pairs"""
+        result = validator.validate({"case": case, "function": function})
+        assert result.passed == expected_valid, \
+            f"{case}+{function} expected {'valid' if expected_valid else 'invalid'}"
 
 
-# SUITE 3: Spatial & Temporal Cases (10 tests)
+# SUITE 3: Spatial & Temporal Cases (18 cases)
 # Tests spatio-temporal semantic roles
 
 class TestSpatioTemporalCases:
     """Tests for location, movement, and time-related cases"""
     
-    def test_loc_location_both(self, validator):
-        """LOC (LOCATION) - static location allows both"""
-        assert validator.validate({"case": "LOC", "function": "STA"}).passed
-        assert validator.validate({"case": "LOC", "function": "DYN"}).passed
-
-    def test_all_goal_dyn(self, validator):
-        """ALL (GOAL) - movement toward requires DYN"""
-        result = validator.validate({"case": "ALL", "function": "DYN"})
-        assert result.passed
-
-    def test_abl_source_both(self, validator):
-        """ABL (SOURCE) - movement from, allows both"""
-        assert validator.validate({"case": "ABL", "function": "STA"}).passed
-        assert validator.validate({"case": "ABL", "function": "DYN"}).passed
-
-    def test_ori_orientation_both(self, validator):
-        """ORI (ORIENTATION) allows both functions"""
-        assert validator.validate({"case": "ORI", "function": "STA"}).passed
-        assert validator.validate({"case": "ORI", "function": "DYN"}).passed
-
-    def test_nav_path_dyn(self, validator):
-        """NAV (PATH) - trajectory of motion"""
-        result = validator.validate({"case": "NAV", "function": "DYN"})
-        assert result.passed
-
-    def test_cnr_simultaneity_both(self, validator):
-        """CNR (SIMULTANEITY) - temporal locative"""
-        assert validator.validate({"case": "CNR", "function": "STA"}).passed
-        assert validator.validate({"case": "CNR", "function": "DYN"}).passed
-
-    def test_pcv_before_both(self, validator):
-        """PCV (BEFORE) - prior to event"""
-        assert validator.validate({"case": "PCV", "function": "STA"}).passed
-        assert validator.validate({"case": "PCV", "function": "DYN"}).passed
-
-    def test_pcr_after_both(self, validator):
-        """PCR (AFTER) - subsequent to event"""
-        assert validator.validate({"case": "PCR", "function": "STA"}).passed
-        assert validator.validate({"case": "PCR", "function": "DYN"}).passed
-
-    def test_elp_elapsed_both(self, validator):
-        """ELP (ELAPSED) - time passed"""
-        assert validator.validate({"case": "ELP", "function": "STA"}).passed
-        assert validator.validate({"case": "ELP", "function": "DYN"}).passed
-
-    def test_irl_reference_both(self, validator):
-        """IRL (REFERENCE) - relative position"""
-        assert validator.validate({"case": "IRL", "function": "STA"}).passed
-        assert validator.validate({"case": "IRL", "function": "DYN"}).passed
+    @pytest.mark.parametrize("case,function,expected_valid", [
+        # LOC (LOCATION) - static location allows both
+        ("LOC", "STA", True),
+        ("LOC", "DYN", True),
+        # ALL (GOAL) - movement toward requires DYN
+        ("ALL", "DYN", True),
+        # ABL (SOURCE) - movement from, allows both
+        ("ABL", "STA", True),
+        ("ABL", "DYN", True),
+        # ORI (ORIENTATION) allows both functions
+        ("ORI", "STA", True),
+        ("ORI", "DYN", True),
+        # NAV (PATH) - trajectory of motion
+        ("NAV", "DYN", True),
+        # CNR (SIMULTANEITY) - temporal locative
+        ("CNR", "STA", True),
+        ("CNR", "DYN", True),
+        # PCV (BEFORE) - prior to event
+        ("PCV", "STA", True),
+        ("PCV", "DYN", True),
+        # PCR (AFTER) - subsequent to event
+        ("PCR", "STA", True),
+        ("PCR", "DYN", True),
+        # ELP (ELAPSED) - time passed
+        ("ELP", "STA", True),
+        ("ELP", "DYN", True),
+        # IRL (REFERENCE) - relative position
+        ("IRL", "STA", True),
+        ("IRL", "DYN", True),
+    ])
+    def test_spatio_temporal_pair(self, validator, case, function, expected_valid):
+        """Parametrized test for spatio-temporal case-function pairs"""
+        result = validator.validate({"case": case, "function": function})
+        assert result.passed == expected_valid, \
+            f"{case}+{function} expected {'valid' if expected_valid else 'invalid'}"
 
 
 # SUITE 4: Edge Cases & Error Handling (15 tests)
@@ -392,6 +361,12 @@ class TestStatisticsAndState:
         result3 = validator.validate({"case": "ERG", "function": "DYN"})
         assert result3.passed
 
+    def test_engines_share_rule_extractor(self, validator):
+        """A second engine on the same grammar file reuses the parsed rules"""
+        other = ValidationEngine(grammar_kb={}, grammar_file=validator.cooccurrence_rules.grammar_file)
+        assert other.cooccurrence_rules.extractor is validator.cooccurrence_rules.extractor
+        assert other.stats["total_validations"] == 0
+
 
 # SUITE 6: RAG Integration (5 tests)
 # Tests RAG-related functionality
@@ -466,5 +441,192 @@ class TestComprehensiveCaseCoverage:
             f"{case}+{function} expected {'valid' if expected_valid else 'invalid'}"
 
 
-# Test count: 76 tests (including parametrized)
+
+# SUITE 8: Autofix
+# Mechanical repairs applied before spending an LLM retry
+
+class TestAutofix:
+    """try_autofix repairs only mistakes with a single known fix"""
+    
+    def test_role_as_function_is_mapped(self, validator):
+        """EXPERIENCER given as function becomes STA"""
+        fixed = validator.try_autofix({"case": "AFF", "function": "EXPERIENCER", "reasoning": "r"})
+        assert fixed is not None
+        fixed_json, result = fixed
+        assert fixed_json == {"case": "AFF", "function": "STA", "reasoning": "r"}
+        assert result.passed
+
+    def test_single_allowed_function_is_forced(self, validator):
+        """AFF+DYN is repaired to AFF+STA"""
+        fixed = validator.try_autofix({"case": "AFF", "function": "DYN"})
+        assert fixed is not None
+        assert fixed[0]["function"] == "STA"
+        assert fixed[1].passed
+
+    def test_ambiguous_case_not_fixed(self, validator):
+        """ERG+STA has more than one allowed function, so it needs the LLM"""
+        assert validator.try_autofix({"case": "ERG", "function": "STA"}) is None
+
+    def test_invalid_case_not_fixed(self, validator):
+        """A bad case code cannot be repaired by changing the function"""
+        assert validator.try_autofix({"case": "Aff", "function": "AGENT"}) is None
+
+    def test_autofix_counted_separately(self, validator):
+        """Fix attempts don't inflate validation stats; successes have their own counter"""
+        validator.try_autofix({"case": "AFF", "function": "DYN"})
+        validator.try_autofix({"case": "ERG", "function": "STA"})
+        stats = validator.get_stats()
+        assert stats["total_validations"] == 0
+        assert stats["autofixed"] == 1
+
+
+
+# SUITE 9: Batch Validation
+# validate_batch must match per-item validate, including stats
+
+class TestBatchValidation:
+    """validate_batch is a drop-in for repeated validate calls"""
+    
+    def test_batch_matches_single(self, validator):
+        """Each batch result equals the single-item result"""
+        items = [
+            {"case": "AFF", "function": "STA"},
+            {"case": "AFF", "function": "DYN"},
+            {"case": "XYZ", "function": "STA"},
+            {"case": "AFF", "function": "STA"},
+            {"case": ["AFF"], "function": "STA"},
+            {},
+        ]
+        single = [validator.validate(item) for item in items]
+        batch = validator.validate_batch(items)
+        assert [r.passed for r in batch] == [r.passed for r in single]
+        assert [len(r.errors) for r in batch] == [len(r.errors) for r in single]
+
+    def test_batch_counts_every_item(self, validator):
+        """Duplicates are evaluated once but counted individually"""
+        validator.validate_batch([{"case": "AFF", "function": "STA"}] * 3 + [{"case": "AFF", "function": "DYN"}])
+        stats = validator.get_stats()
+        assert stats["total_validations"] == 4
+        assert stats["passed"] == 3
+        assert stats["rejected"] == 1
+
+    def test_batch_results_independent(self, validator):
+        """Mutating one result does not affect its duplicates"""
+        first, second = validator.validate_batch([{"case": "AFF", "function": "STA"}] * 2)
+        first.citations.append("extra")
+        assert "extra" not in second.citations
+
+    def test_repeated_validate_is_memoized(self, validator):
+        """Repeated single validations reuse one evaluation, still counted and independent"""
+        validator._validate_pair.cache_clear()
+        first = validator.validate({"case": "AFF", "function": "STA"})
+        second = validator.validate({"case": "AFF", "function": "STA"})
+        assert validator._validate_pair.cache_info().hits == 1
+        assert validator.get_stats()["total_validations"] == 2
+        first.citations.append("extra")
+        assert "extra" not in second.citations
+
+
+# SUITE 10: Rules Cache
+# .rules.pkl is reused only while grammar file, role table and layout match
+
+@pytest.fixture
+def grammar_copy(tmp_path):
+    """Private copy of the grammar file, so cache files land in tmp_path"""
+    grammar_file = tmp_path / "grammar_chunks.json"
+    shutil.copy(Path("data/grammar_chunks.json"), grammar_file)
+    return grammar_file
+
+
+@pytest.fixture
+def extraction_calls(monkeypatch):
+    """Count RuleExtractor.extract_case_constraints calls (0 = served from cache)"""
+    calls = []
+    original = RuleExtractor.extract_case_constraints
+    
+    def counting(self):
+        calls.append(self)
+        return original(self)
+    
+    monkeypatch.setattr(RuleExtractor, "extract_case_constraints", counting)
+    return calls
+
+
+def _bump_mtime(path: Path):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+class TestRulesCache:
+    """CooccurrenceRules persists extracted constraints next to the grammar"""
+    
+    def test_second_load_hits_cache(self, grammar_copy, extraction_calls):
+        """First load extracts and writes .rules.pkl; the next one just reads it"""
+        first = CooccurrenceRules(grammar_copy)
+        assert grammar_copy.with_suffix(".rules.pkl").exists()
+        extracted = len(extraction_calls)
+        assert extracted > 0
+        
+        second = CooccurrenceRules(grammar_copy)
+        assert len(extraction_calls) == extracted
+        assert second.constraints.keys() == first.constraints.keys()
+        assert second.check_case_function("AFF", "DYN")[0] is False
+
+    def test_cache_version_change_rebuilds(self, grammar_copy, extraction_calls, monkeypatch):
+        """Bumping RULES_CACHE_VERSION invalidates existing pickles"""
+        CooccurrenceRules(grammar_copy)
+        extracted = len(extraction_calls)
+        monkeypatch.setattr(cooccurrence_rules, "RULES_CACHE_VERSION", cooccurrence_rules.RULES_CACHE_VERSION + 1)
+        CooccurrenceRules(grammar_copy)
+        assert len(extraction_calls) > extracted
+
+    def test_grammar_mtime_change_rebuilds(self, grammar_copy, extraction_calls):
+        """Touching the grammar file invalidates the cache"""
+        CooccurrenceRules(grammar_copy)
+        extracted = len(extraction_calls)
+        _bump_mtime(grammar_copy)
+        CooccurrenceRules(grammar_copy)
+        assert len(extraction_calls) > extracted
+
+    def test_role_table_change_rebuilds(self, grammar_copy, extraction_calls, monkeypatch):
+        """Editing ROLE_FUNCTION_RULES invalidates the cache"""
+        CooccurrenceRules(grammar_copy)
+        extracted = len(extraction_calls)
+        monkeypatch.setitem(
+            RuleExtractor.ROLE_FUNCTION_RULES, "NEW_ROLE",
+            {"allowed": frozenset({"STA"}), "forbidden": frozenset()}
+        )
+        CooccurrenceRules(grammar_copy)
+        assert len(extraction_calls) > extracted
+
+    def test_corrupt_cache_is_rebuilt(self, grammar_copy, extraction_calls):
+        """A garbage .rules.pkl is ignored and replaced"""
+        cache_file = grammar_copy.with_suffix(".rules.pkl")
+        cache_file.write_bytes(b"not a pickle")
+        rules = CooccurrenceRules(grammar_copy)
+        assert len(extraction_calls) > 0
+        assert rules.check_case_function("AFF", "STA")[0] is True
+        
+        extracted = len(extraction_calls)
+        CooccurrenceRules(grammar_copy)
+        assert len(extraction_calls) == extracted
+
+
+class TestExtractorMemo:
+    """extract_case_constraints is memoized until the grammar file changes"""
+    
+    def test_touching_grammar_invalidates_memo(self, grammar_copy):
+        """Same dict while unchanged; re-extracted after the mtime moves"""
+        extractor = RuleExtractor(grammar_copy)
+        first = extractor.extract_case_constraints()
+        assert extractor.extract_case_constraints() is first
+        
+        _bump_mtime(grammar_copy)
+        second = extractor.extract_case_constraints()
+        assert second is not first
+        assert second.keys() == first.keys()
+        assert extractor.extract_case_constraints() is second
+
+
+# Test count: 112 tests (including parametrized)
 # Run pytest tests/test_validation_engine.py -v
\ No newline at end of file